@@ -1,13 +1,29 @@
 import streamlit as st
-import html
+import sqlite3
 from datetime import date
-from streamlit_quill import st_quill
-import os
+
+from guide_steps import GUIDE_STEPS, prefetch_step, show_step
+from instrumentation import begin_rerun, end_rerun, section, show_debug_panel, timed
+from notice_archive import NoticeArchive
+from page_splicer import HOME_PAGE, INTERRUPTIONS_PAGE, SNIPPET_FIELDS, AnchorNotFoundError, splice
+from quill_sanitizer import sanitize
+
+# Session state keys of the message fields, in render_notice's argument order
+MESSAGE_FIELDS = ('en_title_single', 'fr_title_single', 'msg_date_single', 'english_content_single', 'french_content_single')
+
+# Name of each RenderedNotice field, as on the output tabs
+SNIPPET_LABELS = {
+    "english_html": "English HTML (Full)",
+    "french_html": "French HTML (Full)",
+    "english_alert_box_html": "English Home page HTML code",
+    "french_alert_box_html": "French Home page HTML code",
+}
 
 st.set_page_config(
     page_title="CIPO Service Interruption Message Guide", # Changed from Generator to Guide
     layout="centered",
 )
+begin_rerun()
 
 # --- Summary Section ---
 st.header("CIPO Service Interruption Message Guide") # Already Guide
@@ -31,366 +47,450 @@ st.write(
     "Follow the steps below to create a bilingual service interruption message for your website and apply it to the CMS."
 )
 
-# --- Instructions Section ---
-st.header("Instructions: Using the Tool and CMS") # Changed from Generator to Tool
-
-st.markdown("#### Step 1: Log into Drupal")
-st.write("1) Log into Drupal by clicking the following URL:")
-st.markdown("https://ised-isde.canada.ca/site/canadian-intellectual-property-office/en/user/login")
-
-st.markdown("#### Step 2: Log into the CMS")
-st.write("2) Follow the next steps to correctly log into the Content management system (CMS):")
-
-image_dir = "images" # Directory containing your images
-
-# Display images for steps 1-3 login process
-try:
-    if os.path.exists(image_dir):
-        if os.path.exists(os.path.join(image_dir, "step1.png")):
-            st.image(os.path.join(image_dir, "step1.png"), caption="Step 2a: click Log in with Keycloack", use_container_width=True)
-        else:
-             st.warning(f"Image 'step1.png' not found in '{image_dir}'.")
-        if os.path.exists(os.path.join(image_dir, "step2.png")):
-             st.image(os.path.join(image_dir, "step2.png"), caption="Step 2b: Choose Authentication Method", use_container_width=True)
-        else:
-             st.warning(f"Image 'step2.png' not found in '{image_dir}'.")
-        if os.path.exists(os.path.join(image_dir, "step3.png")):
-            st.image(os.path.join(image_dir, "step3.png"), caption="Step 2c: Complete Authentication: ISED employee", use_container_width=True)
-        else:
-             st.warning(f"Image 'step3.png' not found in '{image_dir}'.")
-    else:
-        st.warning(f"Image directory '{image_dir}' not found. Please ensure it exists relative to app.py.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load login images: {e}")
-
-st.markdown("#### Step 3: Open the Service Interruption Page")
-st.write("3) Once logged in, open the service and website interruptions page:")
-st.markdown("https://ised-isde.canada.ca/site/canadian-intellectual-property-office/en/service-and-website-interruptions")
-
-st.markdown("#### Step 4: Confirm Login and go into Edit mode")
-st.write("4) Confirm that you are logged in. If you cannot see the 'Edit' button at the top of the page, repeat steps 1 to 3.")
-try:
-    if os.path.exists(os.path.join(image_dir, "step4.png")):
-        st.image(os.path.join(image_dir, "step4.png"), caption="Step 4: Confirm 'Edit' Button is Visible", use_container_width=True)
-    else:
-         st.warning(f"Image 'step4.png' not found in '{image_dir}'.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step4.png: {e}")
 
+@st.cache_data(show_spinner=False, max_entries=64)
+def render_html_outputs(english_title, french_title, date_iso, english_content, french_content):
+    """Build the four HTML snippets, memoized on the inputs so unchanged input is never re-rendered."""
+    from notice_render import render_notice  # Jinja2 is only loaded once a notice is generated
 
-st.markdown("#### Step 5: Open Source Editor")
-st.write("5) Click 'Source' as shown in the image below:")
-try:
-    if os.path.exists(os.path.join(image_dir, "step5.png")):
-        st.image(os.path.join(image_dir, "step5.png"), caption="Step 5: Click 'Edit' then 'Source'", use_container_width=True)
-    else:
-         st.warning(f"Image 'step5.png' not found in '{image_dir}'.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step5.png: {e}")
-
-st.markdown("#### Step 6: Create Your Message using the tool below") # Changed from Generator to Tool
-st.write("6) Create your message using the tools below. Once you have generated the HTML code (English and French) in the 'Generate and Copy HTML Output' section, proceed to Step 7.")
-
-st.markdown("---") # Separator
+    return render_notice(english_title, french_title, date_iso, english_content, french_content)
 
 
-# --- Message Creation Section ---
-st.header("Create Your Message Content")
-st.markdown("Use the tools below to create the content and titles for your service interruption message. All fields are required.")
-
+@st.cache_data(show_spinner=False, max_entries=64)
+def clean_content(content):
+    """Strip Quill/Word artifacts from editor HTML before it reaches the templates."""
+    return sanitize(content)
 
-st.subheader("Enter Message Details")
-st.write("Provide the required details for your service interruption message.")
 
-english_title = st.text_input(
-    "English Title",
-    key='en_title_single',
-    help="The headline for your message in English (e.g., 'Online Services Unavailable')"
-)
-french_title = st.text_input(
-    "French Title",
-    key='fr_title_single',
-    help="The headline for your message in French (e.g., 'Services en ligne indisponibles')"
-)
-msg_date = st.date_input(
-    "Message Date", value=date.today(),
-    key='msg_date_single',
-    help="Usually the starting or posting date for this interruption."
-)
+def show_cleanup_savings(content):
+    """Tell the user how much pasted formatting was removed from an editor's content."""
+    if not content:
+        return
+    before = len(content.encode("utf-8"))
+    after = len(clean_content(content).encode("utf-8"))
+    if after < before:
+        st.caption(f"Pasted formatting cleaned up: {before:,} bytes → {after:,} bytes ({1 - after / before:.0%} smaller).")
 
-st.subheader("Write Your Messages")
-st.markdown("Use the editor below to format the main body of your message (bold, lists, etc.).")
 
-# Ensure editor content is initialized for persistence
-if 'english_content_single' not in st.session_state:
-    st.session_state['english_content_single'] = ""
-if 'french_content_single' not in st.session_state:
-    st.session_state['french_content_single'] = ""
+@st.cache_resource(show_spinner=False)
+def get_archive():
+    """Open the archive of past notices once per process, or None if it is unavailable."""
+    try:
+        return NoticeArchive()
+    except sqlite3.Error:
+        return None
 
-st.markdown("**English Message Content (Full)**")
-english_content = st_quill(
-    st.session_state['english_content_single'],
-    html=True,
-    key="en_content_single"
-)
-st.session_state['english_content_single'] = english_content
-st.caption("Main body of the full alert on the Service and website interruptions page.")
-
-with st.expander("Example (English)"):
-    st.write("Our online services will be temporarily unavailable due to planned maintenance. "
-             "We apologize for any inconvenience and appreciate your understanding.")
-
-st.markdown("**French Message Content (Full)**")
-french_content = st_quill(
-    st.session_state['french_content_single'],
-    html=True,
-    key="fr_content_single"
-)
-st.session_state['french_content_single'] = french_content
-st.caption("Main body of the full alert on the Service and website interruptions page.")
 
-with st.expander("Exemple (français)"):
-    st.write("Nos services en ligne seront temporairement indisponibles en raison d'une maintenance planifiée. "
-             "Nous nous excusons pour tout inconvénient et vous remercions de votre compréhension.")
+def archive_notice(english_title, french_title, date_iso, english_content, french_content, notice):
+    archive = get_archive()
+    if archive is None:
+        return
+    try:
+        archive.add(english_title, french_title, date_iso, english_content, french_content, notice)
+    except sqlite3.Error as e:
+        # e.g. the database is locked by another process or read-only
+        st.error(f"The notice could not be saved to past notices: {e}")
+    else:
+        # Include the new notice in the French suggestions
+        get_shared_memory().refresh()
+
+
+@st.cache_resource(show_spinner=False)
+def get_shared_memory():
+    """Start loading the translation memory in the background, once per process."""
+    from translation_memory import SharedMemory
+
+    return SharedMemory(get_archive())
+
+
+def get_translation_memory():
+    """The translation memory, or None while it is still loading."""
+    return get_shared_memory().memory
+
+
+def show_french_suggestions(english_text, label):
+    """List French wording from past notices that matches the English text."""
+    memory = get_translation_memory()
+    if memory is None or not english_text:
+        return
+    suggestions = memory.suggest(english_text)
+    if not suggestions:
+        return
+    with st.expander(f"{label}: suggestions from past notices ({len(suggestions)})"):
+        for suggestion in suggestions:
+            st.markdown(f"**{suggestion.english}**")
+            st.code(suggestion.french, language=None, wrap_lines=True)
+            st.caption(f"{suggestion.score:.0%} match with: {suggestion.matched}")
+
+
+def load_archived_notice(notice_id):
+    """Button callback: copy a past notice into the message fields."""
+    archive = get_archive()
+    archived = archive.get(notice_id) if archive is not None else None
+    if archived is None:
+        # Shown by archive_picker: the past notice was removed since the search
+        st.session_state['archive_load_failed'] = True
+        return
+    st.session_state['en_title_single'] = archived.en_title
+    st.session_state['fr_title_single'] = archived.fr_title
+    st.session_state['msg_date_single'] = date.fromisoformat(archived.date_iso)
+    st.session_state['english_content_single'] = archived.en_body
+    st.session_state['french_content_single'] = archived.fr_body
+    # The Quill editors only take a new value when they are remounted under a new key
+    st.session_state['editor_version'] = st.session_state.get('editor_version', 0) + 1
+    st.session_state['archive_loaded'] = True
+
+
+# --- Past Notices ---
+# Runs as its own fragment: searching does not rerun the message section.
+@st.fragment
+@timed("archive picker")
+def archive_picker():
+    archive = get_archive()
+    if archive is None:
+        return
+
+    if st.session_state.pop('archive_loaded', False):
+        # Redraw the whole app so the message fields show the loaded notice
+        st.rerun()
+    if st.session_state.pop('archive_load_failed', False):
+        st.warning("That past notice is no longer in the archive. Search again to pick another one.")
+
+    with st.expander("Start from a past notice"):
+        # Streamlit has no per-keystroke text widget, so the search runs when
+        # Enter is pressed or the field loses focus. The last word still
+        # matches as a prefix, so a partly typed word is enough.
+        query = st.text_input(
+            "Search past notices",
+            key='archive_query',
+            placeholder="e.g. maintenance, brevets",
+            help="Searches the titles and messages of every notice generated with this tool. "
+                 "Press Enter to search; the last word can be the start of a word (e.g. 'mainten')."
+        )
+        results = archive.search(query)
+        if not results:
+            st.caption("No matching notices." if query else "No notices have been generated yet.")
+        for result in results:
+            label_column, button_column = st.columns([5, 1], vertical_alignment="center")
+            label_column.text(f"{result.date_iso}  {result.en_title} / {result.fr_title}")
+            button_column.button(
+                "Load", key=f'archive_load_{result.id}', on_click=load_archived_notice, args=(result.id,)
+            )
 
-st.markdown("---") # Separator
 
 # --- HTML Generation Section ---
-st.header("Generate and Copy HTML Output")
-st.write("Click the button below to generate the HTML code based on your input. Copy the code needed for the service interruption page ('English HTML (Full)' and 'French HTML (Full)') and the Home page alert ('English Home page HTML code' and 'French Home page HTML code').")
+# Runs as its own fragment: clicking the button only reruns this section.
+@st.fragment
+@timed("output section")
+def output_section():
+    st.header("Generate and Copy HTML Output")
+    st.write("Click the button below to generate the HTML code based on your input. Copy the code needed for the service interruption page ('English HTML (Full)' and 'French HTML (Full)') and the Home page alert ('English Home page HTML code' and 'French Home page HTML code').")
+
+    live_preview = st.toggle(
+        "Live preview",
+        key='live_preview',
+        help="Update the HTML output as you type instead of clicking 'Generate HTML Output'."
+    )
+
+    # Button to trigger generation (replaced by the live preview when it is on)
+    button_clicked = not live_preview and st.button("Generate HTML Output")
+    if button_clicked:
+        # Remember what was generated: any widget below (e.g. the splice upload)
+        # reruns this fragment, and the button is no longer clicked then
+        st.session_state['generated_inputs'] = tuple(st.session_state.get(key) for key in MESSAGE_FIELDS)
+
+    # This section will only display *after* the button is clicked and inputs are valid
+    inputs = tuple(st.session_state.get(key) for key in MESSAGE_FIELDS)
+    if not live_preview:
+        generated = st.session_state.get('generated_inputs')
+        if generated is None:
+            return
+        if generated != inputs:
+            # Never leave HTML for the old inputs on screen to be copied
+            st.info("The message changed since the HTML was generated. Click 'Generate HTML Output' again.")
+            return
+
+    english_title, french_title, msg_date, english_content, french_content = inputs
 
-# Button to trigger generation
-generate_html = st.button("Generate HTML Output")
-
-# This section will only display *after* the button is clicked and inputs are valid
-if generate_html:
     if english_title and french_title and msg_date is not None and english_content is not None and french_content is not None:
 
-        date_iso = msg_date.strftime('%Y-%m-%d')
-
-        # --- Full Message HTML ---
-        # html.escape is used for titles just in case they contain characters that could break HTML
-        english_html = f"""
-<h2 class="text-danger">{html.escape(english_title)} &ndash; (<time class="nowrap" datetime="{date_iso}">{date_iso}</time>)</h2>
-{english_content}
-<p>For more information, please contact our <a data-entity-substitution="canonical" data-entity-type="node" data-entity-uuid="78a10a22-8b11-4c4e-bef2-5c37808ebaba" href="/site/canadian-intellectual-property-office/node/13">Client Service Centre</a>. For date-sensitive material, please review our <a data-entity-substitution="canonical" data-entity-type="node" data-entity-uuid="d0a59429-cdb8-4122-b2b0-6167cf90e56b" href="/site/canadian-intellectual-property-office/node/133">Correspondence Procedures</a>.</p>
-"""
-        french_html = f"""
-<h2 class="text-danger">{html.escape(french_title)} &ndash; (<time class="nowrap" datetime="{date_iso}">{date_iso}</time>)</h2>
-{french_content}
-<p>Pour de plus amples renseignements, veuillez communiquer avec notre <a data-entity-substitution="canonical" data-entity-type="node" data-entity-uuid="78a10a22-8b11-4c4e-bef2-5c37808ebaba" href="/site/canadian-intellectual-property-office/node/13">Centre de services à la clientèle</a>. Pour les demandes assorties de délais, veuillez consulter les <a data-entity-substitution="canonical" data-entity-type="node" data-entity-uuid="d0a59429-cdb8-4122-b2b0-6167cf90e56b" href="/site/canadian-intellectual-property-office/node/133">Procédures relatives à la correspondance</a>.</p>
-"""
-
-        # --- Alert Box HTML (Split into English and French) ---
-        # Note: The UUID fb66b1c4-e3c7-490a-9e61-dd2436a8bc90 seems to be specific to the page linking to the full message (node/28)
-        english_alert_box_html = f"""
-<div class="alert alert-warning col-md-12 mrgn-bttm-sm activeNotice">
-  <p><a data-entity-substitution="canonical" data-entity-type="node" data-entity-uuid="fb66b1c4-e3c7-490a-9e61-dd2436a8bc90" href="/site/canadian-intellectual-property-office/node/28"><span class="text-danger"><strong>Service interruption - {html.escape(english_title)} - (<time class="nowrap" datetime="{date_iso}">{date_iso}</time>)</strong></span></a>
-  </p>
-</div>
-"""
-        french_alert_box_html = f"""
-<div class="alert alert-warning col-md-12 mrgn-bttm-sm activeNotice">
-  <p><a data-entity-substitution="canonical" data-entity-type="node" data-entity-uuid="fb66b1c4-e3c7-490a-9e61-dd2436a8bc90" href="/site/canadian-intellectual-property-office/node/28"><span class="text-danger"><strong>Interruption des services - {html.escape(french_title)} - (<time class="nowrap" datetime="{date_iso}">{date_iso}</time>)</strong></span></a>
-  </p>
-</div>
-"""
+        with section("generate html"):
+            date_iso = msg_date.strftime('%Y-%m-%d')
+            english_content = clean_content(english_content)
+            french_content = clean_content(french_content)
+            notice = render_html_outputs(english_title, french_title, date_iso, english_content, french_content)
+            english_html, french_html, english_alert_box_html, french_alert_box_html = notice
+
+        with section("validate html"):
+            show_validation_problems(notice, date_iso)
+
+        # Keep every generated notice for reuse; the live preview only saves on request
+        if button_clicked or (live_preview and st.button("Save to past notices")):
+            archive_notice(english_title, french_title, date_iso, english_content, french_content, notice)
 
         # --- Display Tabs ---
         # Updated tabs list: Removed Bilingual Full, Split Alert Box into English and French
-        tabs = st.tabs(["English HTML (Full)", "French HTML (Full)", "English Home page HTML code", "French Home page HTML code"])
-
-        with tabs[0]:
-            st.subheader("English HTML Code (Full Message)")
-            st.code(english_html, language="html")
-            st.markdown("Preview:", unsafe_allow_html=True)
-            st.markdown(english_html, unsafe_allow_html=True)
-        with tabs[1]:
-            st.subheader("French HTML Code (Full Message)")
-            st.code(french_html, language="html")
-            st.markdown("Aperçu :", unsafe_allow_html=True)
-            st.markdown(french_html, unsafe_allow_html=True)
-        with tabs[2]:
-            st.subheader("English Home page HTML code")
-            st.code(english_alert_box_html, language="html")
-            st.markdown("Preview:", unsafe_allow_html=True)
-            st.markdown(english_alert_box_html, unsafe_allow_html=True)
-        with tabs[3]:
-            st.subheader("French Home page HTML code")
-            st.code(french_alert_box_html, language="html")
-            st.markdown("Aperçu :", unsafe_allow_html=True)
-            st.markdown(french_alert_box_html, unsafe_allow_html=True)
+        with section("preview tabs"):
+            tabs = st.tabs(["English HTML (Full)", "French HTML (Full)", "English Home page HTML code", "French Home page HTML code"])
+
+            with tabs[0]:
+                st.subheader("English HTML Code (Full Message)")
+                st.code(english_html, language="html")
+                st.markdown("Preview:", unsafe_allow_html=True)
+                st.markdown(english_html, unsafe_allow_html=True)
+            with tabs[1]:
+                st.subheader("French HTML Code (Full Message)")
+                st.code(french_html, language="html")
+                st.markdown("Aperçu :", unsafe_allow_html=True)
+                st.markdown(french_html, unsafe_allow_html=True)
+            with tabs[2]:
+                st.subheader("English Home page HTML code")
+                st.code(english_alert_box_html, language="html")
+                st.markdown("Preview:", unsafe_allow_html=True)
+                st.markdown(english_alert_box_html, unsafe_allow_html=True)
+            with tabs[3]:
+                st.subheader("French Home page HTML code")
+                st.code(french_alert_box_html, language="html")
+                st.markdown("Aperçu :", unsafe_allow_html=True)
+                st.markdown(french_alert_box_html, unsafe_allow_html=True)
 
         st.success("HTML generated. Copy the code you need and continue with the steps below.")
 
+        with st.expander("Optional: insert the code into a saved page source"):
+            st.write("Instead of pasting by hand in Steps 7 and 14, upload the page source you copied from the CMS 'Source' view. The code is inserted at the commented line and you can download the patched source.")
+            page = st.radio(
+                "Page", (INTERRUPTIONS_PAGE, HOME_PAGE), horizontal=True, key='splice_page',
+                format_func={INTERRUPTIONS_PAGE: "Service and website interruptions", HOME_PAGE: "Home page"}.get,
+            )
+            language = st.radio(
+                "Language", ("en", "fr"), horizontal=True, key='splice_language',
+                format_func={"en": "English", "fr": "French"}.get,
+            )
+            uploaded = st.file_uploader("Page source", type=["html", "htm", "txt"], key='splice_source')
+            if uploaded is not None:
+                try:
+                    result = splice(
+                        uploaded.getvalue().decode("utf-8"),
+                        getattr(notice, SNIPPET_FIELDS[(page, language)]),
+                        page,
+                        name=uploaded.name,
+                    )
+                except UnicodeDecodeError:
+                    st.error(f"'{uploaded.name}' is not UTF-8 text. Copy the page source from the CMS 'Source' view and save it as UTF-8.")
+                except AnchorNotFoundError as e:
+                    st.error(f"Could not find the commented line in the uploaded source: {e}")
+                else:
+                    if result.changed:
+                        st.code(result.diff, language="diff")
+                    else:
+                        st.info("This message is already in the uploaded page source.")
+                    st.download_button(
+                        "Download patched source", result.source, file_name=uploaded.name, mime="text/html"
+                    )
+
     else:
         st.warning("Please ensure all title, date, and content fields are filled out before generating HTML.")
 
-st.markdown("---") # Separator
 
-# --- Continue CMS Steps Section (Service Interruption Page) ---
-st.header("Instructions (Cont.): Applying HTML to CMS - Service Interruption Page")
+def show_validation_problems(notice, date_iso):
+    """Warn about generated snippets that could break the CMS page, before they are copied."""
+    from notice_validator import validate_notice  # needs notice_render, like render_html_outputs
 
-st.markdown("#### Step 7: Paste Full HTML Message into Service Interruption Page Source")
-st.write("7) Copy the 'English HTML (Full)' and 'French HTML (Full)' code from the sections above. Paste the **English** code into the English version of the Service Interruption page's Source editor, right where the red line indicates above the commented line of code (in yellow). Please do not modify or delete anything else on the page. Repeat for the **French** code on the French version of the page.")
-try:
-    if os.path.exists(os.path.join(image_dir, "step6.png")):
-        st.image(os.path.join(image_dir, "step6.png"), caption="Step 7: Paste HTML into Service Interruption Page Source Editor", use_container_width=True)
-    else:
-         st.warning(f"Image 'step6.png' not found in '{image_dir}'.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step6.png: {e}")
+    for field, problems in validate_notice(notice, date_iso).items():
+        # Problems quote tags; escape them so the markdown shows them as text
+        lines = "\n".join(f"- {str(problem).replace('<', '&lt;')}" for problem in problems)
+        st.error(f"**{SNIPPET_LABELS[field]}** may break the page:\n\n{lines}")
 
 
-st.markdown("#### Step 7.1: View Result in CMS")
-st.write("7.1) Once you have copy-pasted the full messages HTML code (English and French), click on 'Source' again to view the result. This is how the message will display once you publish the page.")
-try:
-    # Reusing step5.png as requested
-    if os.path.exists(os.path.join(image_dir, "step5.png")):
-        st.image(os.path.join(image_dir, "step5.png"), caption="Step 7.1: Click 'Source' to preview", use_container_width=True)
-    else:
-         st.warning(f"Image 'step5.png' not found for Step 7.1.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step5.png for Step 7.1: {e}")
+def quill_editor(value, html, key):
+    # Imported on first use: the component, and the pandas/pyarrow stack Streamlit
+    # loads to call it, are only needed once a session reaches the editors
+    from streamlit_quill import st_quill
 
+    return st_quill(value, html=html, key=key)
 
-st.markdown("#### Step 8: Save Service Interruption Page as Draft")
-st.write("8) Once satisfied with the message on the Service Interruption page, scroll down and select 'Draft' instead of 'Published'.")
-try:
-    if os.path.exists(os.path.join(image_dir, "step7.png")):
-        st.image(os.path.join(image_dir, "step7.png"), caption="Step 8: Select 'Draft'", use_container_width=True)
-    else:
-         st.warning(f"Image 'step7.png' not found in '{image_dir}'.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step7.png: {e}")
-
-st.markdown("#### Step 9: Review Service Interruption Page Draft")
-st.write("9) Click 'Save (this translation)' and you will be able to review the Draft version of the page. Please note that you also need to review the French version of the page.")
-st.markdown("If you need to make changes to the Draft version, go back to Step 4. To share the Draft page for an approval or review, copy the draft URL as indicated in the screenshot below: ")
-try:
-    if os.path.exists(os.path.join(image_dir, "step9-1.png")):
-        st.image(os.path.join(image_dir, "step9-1.png"), caption="Copy Draft URL to share page", use_container_width=True)
-    else:
-         st.warning(f"Image 'step9-1.png' not found in '{image_dir}'.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step9-1.png: {e}")
-
-st.markdown("#### Step 10: Publish the Full Message")
-st.write("10) Once satisfied with the message on the Service Interruption page and after having reviewed both versions (ENG-FRA), click 'Edit', scroll down, and 'Save as Published' to publish the full message live.")
-try:
-    if os.path.exists(os.path.join(image_dir, "step8.png")):
-        st.image(os.path.join(image_dir, "step8.png"), caption="Step 10: Save as 'Published'", use_container_width=True)
-    else:
-         st.warning(f"Image 'step8.png' not found in '{image_dir}'.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step8.png: {e}")
-
-st.markdown("---") # Separator
-
-# --- Continue CMS Steps Section (Home Page) ---
-st.header("Instructions: Applying HTML to CMS - Home Page Alert Box")
-st.markdown("Our service interruption message is now published live on the Service and website interruptions page (https://ised-isde.canada.ca/site/canadian-intellectual-property-office/en/service-and-website-interruptions). Now, we need to display a banner message on the Home page to lead users to the full message. The following steps will guide you through publishing this banner on the CIPO Home page. Steps are similar to the previous but detailed below, please follow all steps.")
-
-st.markdown("#### Step 11: Open the CIPO Home page")
-st.write("11) Open the CIPO Home page (https://ised-isde.canada.ca/site/canadian-intellectual-property-office/en) and head into Edit mode.")
-try:
-    # Reusing step4.png as requested
-    if os.path.exists(os.path.join(image_dir, "step4.png")):
-        st.image(os.path.join(image_dir, "step4.png"), caption="Step 11: Edit CIPO Home Page", use_container_width=True)
-    else:
-         st.warning(f"Image 'step4.png' not found for Step 11.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step4.png for Step 11: {e}")
-
-st.markdown("#### Step 12: Open Homepage Source Editor")
-st.write("12) Switch the Home page into 'Source' view and find the *****************NOTICES****** line. You will paste the Home page code (Alert Box HTML) below that line as explained in Step 14.")
-try:
-    # Reusing step5.png as requested
-    if os.path.exists(os.path.join(image_dir, "step12.png")):
-        st.image(os.path.join(image_dir, "step12.png"), caption="Step 12: Open Homepage Source and Find Comment", use_container_width=True)
-    else:
-         st.warning(f"Image 'step12.png' not found for Step 12.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step5.png for Step 12: {e}")
-
-st.markdown("#### Step 13: Copy Generated Home page HTML code")
-st.write("13) Copy the 'English Home page HTML code' and 'French Home page HTML code' generated in the section above.")
-try:
-    if os.path.exists(os.path.join(image_dir, "step9.png")):
-        st.image(os.path.join(image_dir, "step9.png"), caption="Step 13: Copy Home page HTML Code", use_container_width=True)
-    else:
-         st.warning(f"Image 'step9.png' not found in '{image_dir}'.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step9.png: {e}")
-
-st.markdown("#### Step 14: Paste Home page HTML code")
-st.write("14) Paste the **English** 'Home page HTML code' exactly here in the Home page Source editor, below the `<!-- *****************NOTICES****** -->` line (make sure to be in Edit mode, as indicated in Step 11). Repeat for the **French** code on the French version of the Home page.")
-try:
-    if os.path.exists(os.path.join(image_dir, "step10.png")):
-        st.image(os.path.join(image_dir, "step10.png"), caption="Step 14: Paste Home page HTML into Source Editor", use_container_width=True)
-    else:
-         st.warning(f"Image 'step10.png' not found in '{image_dir}'.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step10.png: {e}")
-
-st.markdown("#### Step 15: View Result and Save Home page as Draft")
-st.write("15) Once you have copy-pasted the Home page HTML code (English and French), click on 'Source' again to view the result. This is how the message will display once you publish the page. Once satisfied with the message, scroll down and select 'Draft' instead of 'Published'.")
-try:
-    # Reusing step7.png as requested
-    if os.path.exists(os.path.join(image_dir, "step7.png")):
-        st.image(os.path.join(image_dir, "step7.png"), caption="Step 15: Preview and Save as Draft", use_container_width=True)
-    else:
-         st.warning(f"Image 'step7.png' not found for Step 15.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step7.png for Step 15: {e}")
-
-st.markdown("#### Step 16: Review Home page Draft")
-st.write("16) Click 'Save (this translation)' and you will be able to review the Draft version of the page. Please note that you also need to review the French version of the page.")
-st.markdown("If you need to make changes to the Draft version, go back to Step 11.") # Updated note to point to Step 11
-
-st.markdown("#### Step 17: Publish the Home page Alert")
-st.write("17) Once satisfied with the message on the Home page and after having reviewed both versions (ENG-FRA), click 'Edit', scroll down, and 'Save as Published' to publish the message live.")
-try:
-    # Reusing step8.png as requested
-    if os.path.exists(os.path.join(image_dir, "step8.png")):
-        st.image(os.path.join(image_dir, "step8.png"), caption="Step 17: Save as 'Published'", use_container_width=True)
-    else:
-         st.warning(f"Image 'step8.png' not found in '{image_dir}'.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step8.png for Step 17: {e}")
 
-st.markdown("The message on the Home page is now live, this short message has a direct link to the full version of the service interruption message.")
+# --- Message Creation Section ---
+# Runs as its own fragment: typing in the fields or editors reruns this section
+# (and the output section below it) without re-rendering the instruction steps.
+@st.fragment
+@timed("message section")
+def message_section():
+    st.header("Create Your Message Content")
+    st.markdown("Use the tools below to create the content and titles for your service interruption message. All fields are required.")
+
+    archive_picker()
+
+    st.subheader("Enter Message Details")
+    st.write("Provide the required details for your service interruption message.")
+
+    st.text_input(
+        "English Title",
+        key='en_title_single',
+        help="The headline for your message in English (e.g., 'Online Services Unavailable')"
+    )
+    st.text_input(
+        "French Title",
+        key='fr_title_single',
+        help="The headline for your message in French (e.g., 'Services en ligne indisponibles')"
+    )
+    show_french_suggestions(st.session_state.get('en_title_single'), "French Title")
+    # Set once here rather than with value=, which Streamlit would report as
+    # conflicting with the value kept in session state
+    if 'msg_date_single' not in st.session_state:
+        st.session_state['msg_date_single'] = date.today()
+    st.date_input(
+        "Message Date",
+        key='msg_date_single',
+        help="Usually the starting or posting date for this interruption."
+    )
+
+    st.subheader("Write Your Messages")
+    st.markdown("Use the editor below to format the main body of your message (bold, lists, etc.).")
+
+    # Ensure editor content is initialized for persistence
+    if 'english_content_single' not in st.session_state:
+        st.session_state['english_content_single'] = ""
+    if 'french_content_single' not in st.session_state:
+        st.session_state['french_content_single'] = ""
+
+    st.markdown("**English Message Content (Full)**")
+    with section("editor en"):
+        english_content = quill_editor(
+            st.session_state['english_content_single'],
+            html=True,
+            key=f"en_content_single_{st.session_state.get('editor_version', 0)}"
+        )
+    st.session_state['english_content_single'] = english_content
+    st.caption("Main body of the full alert on the Service and website interruptions page.")
+    show_cleanup_savings(english_content)
+
+    with st.expander("Example (English)"):
+        st.write("Our online services will be temporarily unavailable due to planned maintenance. "
+                 "We apologize for any inconvenience and appreciate your understanding.")
+
+    st.markdown("**French Message Content (Full)**")
+    show_french_suggestions(english_content, "French Message Content")
+    with section("editor fr"):
+        french_content = quill_editor(
+            st.session_state['french_content_single'],
+            html=True,
+            key=f"fr_content_single_{st.session_state.get('editor_version', 0)}"
+        )
+    st.session_state['french_content_single'] = french_content
+    st.caption("Main body of the full alert on the Service and website interruptions page.")
+    show_cleanup_savings(french_content)
+
+    with st.expander("Exemple (français)"):
+        st.write("Nos services en ligne seront temporairement indisponibles en raison d'une maintenance planifiée. "
+                 "Nous nous excusons pour tout inconvénient et vous remercions de votre compréhension.")
+
+    st.markdown("---") # Separator
+
+    output_section()
 
 
-st.markdown("---") # Separator
-st.markdown("#### Final results")
-st.write("After publishing the complete message on the Service and website interruptions page and the banner on the CIPO Home page, everything should look like this:")
-try:
-    # Reusing step8.png as requested
-    if os.path.exists(os.path.join(image_dir, "final1.png")):
-        st.image(os.path.join(image_dir, "final1.png"), caption="Banner on the CIPO Home page", use_container_width=True)
-    else:
-         st.warning(f"Image 'final1.png' not found in '{image_dir}'.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image step12: {e}")
-try:
-    # Reusing step8.png as requested
-    if os.path.exists(os.path.join(image_dir, "final2.png")):
-        st.image(os.path.join(image_dir, "final2.png"), caption="Full message on the Service and website interruptions page", use_container_width=True)
-    else:
-         st.warning(f"Image 'final2.png' not found in '{image_dir}'.")
-except Exception as e:
-    st.error(f"An error occurred while trying to load image final2.png: {e}")
+
+# --- Instructions Section ---
+
+def current_notice():
+    """Render the notice from the message fields, or None while any of them is empty."""
+    english_title = st.session_state.get('en_title_single')
+    french_title = st.session_state.get('fr_title_single')
+    msg_date = st.session_state.get('msg_date_single')
+    english_content = st.session_state.get('english_content_single')
+    french_content = st.session_state.get('french_content_single')
+    if not (english_title and french_title and msg_date is not None and english_content is not None and french_content is not None):
+        return None
+    return render_html_outputs(
+        english_title, french_title, msg_date.strftime('%Y-%m-%d'),
+        clean_content(english_content), clean_content(french_content),
+    )
+
+
+def show_step_snippets(step):
+    """Repeat the generated code a wizard step asks the user to copy."""
+    notice = current_notice()
+    if notice is None:
+        st.info("Generate the HTML in Step 6 to see the code to copy here.")
+        return
+    for field in step.snippets:
+        st.markdown(f"**{SNIPPET_LABELS[field]}**")
+        st.code(getattr(notice, field), language="html")
+
+
+def go_to_step(index):
+    st.session_state['wizard_step'] = index
+
+
+@timed("guide page")
+def show_guide_page():
+    """Every step on one page, with the message tool after Step 6."""
+    for step in GUIDE_STEPS:
+        show_step(step)
+        if step.tool:
+            st.markdown("---") # Separator
+            message_section()
+            st.markdown("---") # Separator
+
+
+@timed("wizard")
+def show_wizard():
+    """Only the current step; the next step's screenshots are prefetched."""
+    last = len(GUIDE_STEPS) - 1
+    index = st.selectbox(
+        "Go to step", range(len(GUIDE_STEPS)),
+        key='wizard_step',
+        format_func=lambda i: GUIDE_STEPS[i].title
+    )
+    st.progress((index + 1) / len(GUIDE_STEPS), text=f"{index + 1} of {len(GUIDE_STEPS)}")
+
+    step = GUIDE_STEPS[index]
+    show_step(step, full_page=False)
+    if step.tool:
+        st.markdown("---") # Separator
+        message_section()
+    if step.snippets:
+        show_step_snippets(step)
+
+    back_column, _, next_column = st.columns([1, 4, 1])
+    back_column.button("Back", disabled=index == 0, on_click=go_to_step, args=(index - 1,))
+    next_column.button("Next", type="primary", disabled=index == last, on_click=go_to_step, args=(index + 1,))
+    if index < last:
+        prefetch_step(GUIDE_STEPS[index + 1])
+
+
+# Streamlit forgets the value of a widget that is not drawn in a run, so
+# keep the message fields while the wizard shows steps without them.
+for key in ('en_title_single', 'fr_title_single', 'msg_date_single', 'live_preview', 'archive_query', 'wizard_step'):
+    if key in st.session_state:
+        st.session_state[key] = st.session_state[key]
+
+if st.toggle("Show all steps", key='show_all_steps', help="Show the whole guide on one page, e.g. for printing."):
+    show_guide_page()
+else:
+    show_wizard()
 
 
 # --- Utility Section ---
 st.header("App Utilities")
 
-if st.button("Clear All Inputs"):
+
+def clear_inputs():
+    """Button callback: forget every input, but stay on the same step of the guide."""
+    kept = {key: st.session_state[key] for key in ('wizard_step', 'show_all_steps') if key in st.session_state}
+    editor_version = st.session_state.get('editor_version', 0)
     st.session_state.clear()
-    st.rerun()
-    st.info("Inputs cleared.")
+    st.session_state.update(kept)
+    # Remount the Quill editors so they drop their text too
+    st.session_state['editor_version'] = editor_version + 1
+
+
+st.button("Clear All Inputs", on_click=clear_inputs)
 
 st.info(
     "Fill out the details and content fields above, then click 'Generate HTML Output' to see the results."
-)
\ No newline at end of file
+)
+
+show_debug_panel()
+end_rerun()
@@ -0,0 +1,123 @@
+import io
+import os
+from typing import NamedTuple
+
+import streamlit as st
+
+from instrumentation import add_media_bytes, section
+
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+
+# Streamlit's centered layout is 730px wide; 1460 covers HiDPI screens and is the
+# largest width st.image will ever serve, so it is the only width transcoded.
+DEFAULT_WIDTH = 1460
+
+# Containers with this key prefix get the CSS class "st-key-prefetch-...",
+# which the rule below hides.
+PREFETCH_KEY_PREFIX = "prefetch-"
+PREFETCH_STYLE = '<style>[class*="st-key-%s"] {display: none}</style>' % PREFETCH_KEY_PREFIX
+
+
+class StepImage(NamedTuple):
+    filename: str
+    caption: str
+
+
+# Manifest of every screenshot shown in the guide, keyed by step.
+# Several steps reuse the same file; it is only transcoded and shipped once.
+STEP_IMAGES = {
+    "2a": StepImage("step1.png", "Step 2a: click Log in with Keycloack"),
+    "2b": StepImage("step2.png", "Step 2b: Choose Authentication Method"),
+    "2c": StepImage("step3.png", "Step 2c: Complete Authentication: ISED employee"),
+    "4": StepImage("step4.png", "Step 4: Confirm 'Edit' Button is Visible"),
+    "5": StepImage("step5.png", "Step 5: Click 'Edit' then 'Source'"),
+    "7": StepImage("step6.png", "Step 7: Paste HTML into Service Interruption Page Source Editor"),
+    "7.1": StepImage("step5.png", "Step 7.1: Click 'Source' to preview"),
+    "8": StepImage("step7.png", "Step 8: Select 'Draft'"),
+    "9": StepImage("step9-1.png", "Copy Draft URL to share page"),
+    "10": StepImage("step8.png", "Step 10: Save as 'Published'"),
+    "11": StepImage("step4.png", "Step 11: Edit CIPO Home Page"),
+    "12": StepImage("step12.png", "Step 12: Open Homepage Source and Find Comment"),
+    "13": StepImage("step9.png", "Step 13: Copy Home page HTML Code"),
+    "14": StepImage("step10.png", "Step 14: Paste Home page HTML into Source Editor"),
+    "15": StepImage("step7.png", "Step 15: Preview and Save as Draft"),
+    "17": StepImage("step8.png", "Step 17: Save as 'Published'"),
+    "final1": StepImage("final1.png", "Banner on the CIPO Home page"),
+    "final2": StepImage("final2.png", "Full message on the Service and website interruptions page"),
+}
+
+
+def _transcode(path, width):
+    """Return the smallest PNG encoding of the image at `path`, at most `width` px wide."""
+    # Pillow is only needed the first time each image is served
+    from PIL import Image
+
+    with open(path, "rb") as f:
+        original = f.read()
+    image = Image.open(io.BytesIO(original))
+    resized = image.width > width
+    if resized:
+        height = round(image.height * width / image.width)
+        image = image.resize((width, height), Image.LANCZOS)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+
+    # Screenshots have few distinct colours, so a 256-colour palette is visually
+    # lossless and far smaller than the JPEG Streamlit would otherwise produce.
+    quantized = image.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+    buffer = io.BytesIO()
+    quantized.save(buffer, format="PNG", optimize=True)
+    encoded = buffer.getvalue()
+
+    if not resized and len(original) <= len(encoded):
+        return original
+    return encoded
+
+
+@st.cache_resource(show_spinner=False)
+def load_asset(filename, width=DEFAULT_WIDTH, image_dir=IMAGE_DIR):
+    """Transcode one screenshot once per process; None if the file is missing.
+
+    Images are transcoded when first shown, so a session that opens one
+    wizard step does not wait for the whole manifest.
+    """
+    path = os.path.join(image_dir, filename)
+    if not os.path.isfile(path):
+        return None
+    return _transcode(path, width)
+
+
+def show_step_image(step, width=DEFAULT_WIDTH):
+    """Display the screenshot for `step` from the in-memory asset cache."""
+    entry = STEP_IMAGES[step]
+    with section(f"image {step}"):
+        try:
+            data = load_asset(entry.filename, width)
+            if data is None:
+                st.warning(f"Image '{entry.filename}' not found in '{os.path.basename(IMAGE_DIR)}'.")
+                return
+            # The bytes are already a PNG no wider than Streamlit's maximum, so with the
+            # format given it serves them as-is. It still opens the header with
+            # Pillow on every rerun to check the size, but never re-encodes.
+            st.image(data, caption=entry.caption, use_container_width=True, output_format="PNG")
+            add_media_bytes(len(data))
+        except Exception as e:
+            st.error(f"An error occurred while trying to load image {entry.filename}: {e}")
+
+
+def prefetch_step_image(step, width=DEFAULT_WIDTH):
+    """Have the browser download the screenshot for `step` without showing it.
+
+    The image is drawn with the same st.image call as show_step_image, inside a
+    container hidden with CSS. Streamlit serves media under a hash of the bytes,
+    so the URL is the same one show_step_image produces later and the browser
+    already has it cached.
+    """
+    entry = STEP_IMAGES[step]
+    data = load_asset(entry.filename, width)
+    if data is None:
+        return
+    # Style-only HTML goes to Streamlit's event container and takes no space
+    st.html(PREFETCH_STYLE)
+    with st.container(key=f"{PREFETCH_KEY_PREFIX}{step}"):
+        st.image(data, use_container_width=True, output_format="PNG")
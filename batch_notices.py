@@ -0,0 +1,184 @@
+"""Generate service interruption HTML for many notices at once.
+
+Reads a CSV or JSON-lines file with the columns en_title, fr_title, date,
+en_body and fr_body, and streams the same four snippets the app's
+"Generate HTML Output" button produces for every row.
+
+Usage:
+    python batch_notices.py notices.csv                 # JSON lines on stdout
+    python batch_notices.py notices.jsonl -o out/       # four .html files per row
+    python batch_notices.py notices.csv --workers 4     # render in a process pool
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+
+from notice_render import render_notice
+from quill_sanitizer import sanitize
+
+# Same rule as the app: titles and date are required, bodies may be empty
+REQUIRED_FIELDS = ("en_title", "fr_title", "date")
+
+# File suffix for each snippet when writing to a directory
+OUTPUT_FILES = {
+    "english_html": "en_full.html",
+    "french_html": "fr_full.html",
+    "english_alert_box_html": "en_home.html",
+    "french_alert_box_html": "fr_home.html",
+}
+
+
+class RowError(ValueError):
+    """A row that cannot be turned into a notice."""
+
+    def __init__(self, row_number, message):
+        super().__init__(row_number, message)
+        self.row_number = row_number
+        self.message = message
+
+    def __str__(self):
+        return f"row {self.row_number}: {self.message}"
+
+
+def read_rows(stream, fmt):
+    """Yield one dict per input row without loading the whole file.
+
+    A JSON line that cannot be parsed is yielded as the ValueError describing
+    it, so render_row() reports that row and the rest of the batch goes on.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield ValueError(f"invalid JSON: {e.msg} at column {e.colno}")
+
+
+def render_row(numbered_row):
+    """Sanitize and render one (row_number, row) pair. Runs in worker processes too."""
+    row_number, row = numbered_row
+    if isinstance(row, ValueError):
+        raise RowError(row_number, str(row))
+    if not isinstance(row, dict):
+        raise RowError(row_number, f"expected an object, got {type(row).__name__}")
+    for field in REQUIRED_FIELDS + ("en_body", "fr_body"):
+        if row.get(field) is not None and not isinstance(row[field], str):
+            raise RowError(row_number, f"{field} must be a string, got {type(row[field]).__name__}")
+    missing = [field for field in REQUIRED_FIELDS if not row.get(field)]
+    if missing:
+        raise RowError(row_number, f"missing {', '.join(missing)}")
+    try:
+        msg_date = date.fromisoformat(row["date"])
+    except ValueError:
+        raise RowError(row_number, f"invalid date {row['date']!r}, expected YYYY-MM-DD") from None
+    # Bodies are cleaned exactly as the app does before rendering
+    return row_number, render_notice(
+        row["en_title"], row["fr_title"], msg_date, sanitize(row.get("en_body")), sanitize(row.get("fr_body"))
+    )
+
+
+def _render_guarded(numbered_row):
+    try:
+        return render_row(numbered_row)
+    except RowError as e:
+        return numbered_row[0], e
+
+
+def _render_chunk(chunk):
+    return [_render_guarded(numbered_row) for numbered_row in chunk]
+
+
+def generate(rows, workers=0, chunk_size=256):
+    """Yield (row_number, RenderedNotice or RowError) in input order.
+
+    With `workers` > 0 rows are sent to a process pool in chunks of
+    `chunk_size`. Only two chunks per worker are in flight at a time, so
+    memory stays bounded regardless of the input size.
+    """
+    numbered = enumerate(rows, start=1)
+    if workers <= 0:
+        yield from map(_render_guarded, numbered)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        while True:
+            chunk = list(islice(numbered, chunk_size))
+            if chunk:
+                pending.append(pool.submit(_render_chunk, chunk))
+            if pending and (not chunk or len(pending) >= 2 * workers):
+                yield from pending.popleft().result()
+            if not chunk and not pending:
+                break
+
+
+def write_jsonl(results, out):
+    errors = 0
+    for row_number, result in results:
+        if isinstance(result, RowError):
+            errors += 1
+            print(result, file=sys.stderr)
+            continue
+        record = {"row": row_number, **result._asdict()}
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write("\n")
+    return errors
+
+
+def write_files(results, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    errors = 0
+    for row_number, result in results:
+        if isinstance(result, RowError):
+            errors += 1
+            print(result, file=sys.stderr)
+            continue
+        for field, suffix in OUTPUT_FILES.items():
+            path = os.path.join(out_dir, f"{row_number:06d}_{suffix}")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(getattr(result, field))
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate service interruption HTML for every row of a CSV or JSON-lines file."
+    )
+    parser.add_argument("input", help="CSV or JSON-lines file, or '-' for stdin")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="input format (default: from the file extension)")
+    parser.add_argument("-o", "--out-dir", help="write four .html files per row here instead of JSON lines on stdout")
+    parser.add_argument("--workers", type=int, default=0, help="render in a pool of this many processes")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if args.input.lower().endswith(".csv") else "jsonl"
+
+    if args.input == "-":
+        stream = sys.stdin
+    else:
+        stream = open(args.input, newline="", encoding="utf-8-sig")
+    with stream:
+        results = generate(read_rows(stream, fmt), workers=args.workers)
+        if args.out_dir:
+            errors = write_files(results, args.out_dir)
+        else:
+            errors = write_jsonl(results, sys.stdout)
+
+    if errors:
+        print(f"{errors} row(s) skipped", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""Rerun latency, delta bytes and per-session memory of the guide under AppTest.
+
+Usage: python benchmarks/bench_app.py [--sessions 20] [--budgets benchmarks/app_budgets.json]
+       python benchmarks/bench_app.py [--sessions 20] --write-budgets   # record the current numbers plus headroom
+
+Scripts the real authoring flow in N simulated sessions: load the page at
+the wizard step with the message editor, fill the titles, set the date, fill both message bodies, click "Generate
+HTML Output", then "Clear All Inputs". AppTest has no frontend, so the
+Quill editors cannot be typed into; their content is put in session state
+the same way the editors would put it there.
+
+AppTest swaps a global runtime on every run, so sessions cannot run in
+parallel threads. Instead, the N sessions are kept alive together and
+advanced one step at a time, in turn, the way a team editing at once
+would interleave. Reported:
+
+- rerun wall time per step, p50/p99 (server time only; no browser)
+- bytes of ForwardMsg deltas sent per rerun, per step
+- memory retained per live session (tracemalloc, measured in a second pass
+  so tracing does not slow the timed pass), and the bytes of the strings
+  in session state (titles and both message bodies)
+
+Exits with status 1 when a measured value exceeds its budget. The tail
+latencies and memory depend on how many sessions are interleaved, so the
+budgets file holds a separate set of budgets per session count, and a run is
+only compared with the budgets recorded for its own count. Timings depend on
+the machine, so re-record the budgets when the reference machine changes.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1 import app_test, local_script_runner  # noqa: E402
+
+from guide_steps import GUIDE_STEPS  # noqa: E402
+
+APP = os.path.join(ROOT, "Service_Interruption_Guide.py")
+DEFAULT_BUDGETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_budgets.json")
+HEADROOM = 1.5  # --write-budgets allows this much regression over the measured value
+RECORD_RUNS = 3  # --write-budgets records the worst of this many runs, so one quiet run does not set them
+
+ENGLISH_CONTENT = (
+    "<p>Our online services will be temporarily unavailable due to planned maintenance.</p>"
+    "<ul><li><strong>Patents</strong></li><li>Trademarks</li><li>Industrial designs</li></ul>"
+    "<p>We apologize for any inconvenience and appreciate your understanding.</p>"
+)
+FRENCH_CONTENT = (
+    "<p>Nos services en ligne seront temporairement indisponibles en raison d'une maintenance planifiée.</p>"
+    "<ul><li><strong>Brevets</strong></li><li>Marques de commerce</li><li>Dessins industriels</li></ul>"
+    "<p>Nous nous excusons pour tout inconvénient et vous remercions de votre compréhension.</p>"
+)
+
+_delta_bytes = []
+
+
+class _MeasuredScriptRunner(app_test.LocalScriptRunner):
+    """LocalScriptRunner that records the size of the messages of each run."""
+
+    def run(self, *args, **kwargs):
+        tree = super().run(*args, **kwargs)
+        _delta_bytes.append(sum(msg.ByteSize() for msg in self.forward_msgs()))
+        return tree
+
+
+app_test.LocalScriptRunner = _MeasuredScriptRunner
+
+# AppTest compiles the script into a new ScriptCache on every run; the server
+# keeps one per process. Share one so the bytecode is not charged to each session.
+_script_cache = app_test.ScriptCache()
+app_test.ScriptCache = local_script_runner.ScriptCache = lambda: _script_cache
+
+
+def _button(at, label):
+    return next(button for button in at.button if button.label == label)
+
+
+def _load(at, i):
+    # Open the wizard on the step with the message editor
+    at.session_state["wizard_step"] = next(index for index, step in enumerate(GUIDE_STEPS) if step.tool)
+    return at.run()
+
+
+def _titles(at, i):
+    at.text_input(key="en_title_single").input(f"Online services unavailable {i}")
+    return at.text_input(key="fr_title_single").input(f"Services en ligne indisponibles {i}").run()
+
+
+def _date(at, i):
+    return at.date_input(key="msg_date_single").set_value(date(2025, 1 + i % 12, 1 + i % 28)).run()
+
+
+def _content(at, i):
+    at.session_state["english_content_single"] = ENGLISH_CONTENT
+    at.session_state["french_content_single"] = FRENCH_CONTENT
+    return at.run()
+
+
+def _generate(at, i):
+    return _button(at, "Generate HTML Output").click().run()
+
+
+def _clear(at, i):
+    return _button(at, "Clear All Inputs").click().run()
+
+
+FLOW = [("load", _load), ("titles", _titles), ("date", _date), ("content", _content),
+        ("generate", _generate), ("clear", _clear)]
+# Memory is measured with every session holding a generated notice
+MEMORY_STEP = "generate"
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _state_bytes(at):
+    total = 0
+    for key in at.session_state.filtered_state:
+        value = at.session_state[key]
+        if isinstance(value, str):
+            total += len(value.encode("utf-8"))
+    return total
+
+
+def _new_session():
+    return AppTest.from_file(APP, default_timeout=60)
+
+
+def timed_pass(sessions):
+    """Advance every session through the flow; return {step: ([ms], [bytes])}."""
+    results = {name: ([], []) for name, _ in FLOW}
+    apps = [_new_session() for _ in range(sessions)]
+    for name, step in FLOW:
+        for i, at in enumerate(apps):
+            begin = time.perf_counter()
+            step(at, i)
+            elapsed = (time.perf_counter() - begin) * 1000
+            if at.exception:
+                raise RuntimeError(f"session {i}, step {name}: {at.exception[0].message}")
+            results[name][0].append(elapsed)
+            results[name][1].append(_delta_bytes[-1])
+    return results
+
+
+def memory_pass(sessions):
+    """Return (bytes retained per live session, bytes of session state per session)."""
+    apps = [_new_session() for _ in range(sessions)]
+    tracemalloc.start()
+    gc.collect()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for name, step in FLOW:
+        for i, at in enumerate(apps):
+            step(at, i)
+        if name == MEMORY_STEP:
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0] - baseline
+            state = sum(_state_bytes(at) for at in apps)
+            break
+    tracemalloc.stop()
+    return retained / sessions, state / sessions
+
+
+def measure(sessions):
+    # One throwaway session first, so imports and process-wide caches
+    # (images, archive, translation memory) are not charged to the sessions
+    timed_pass(1)
+    results = timed_pass(sessions)
+    per_session, state = memory_pass(sessions)
+
+    metrics = {}
+    for name, (timings, sizes) in results.items():
+        metrics[f"{name}.p50_ms"] = _percentile(timings, 0.5)
+        metrics[f"{name}.p99_ms"] = _percentile(timings, 0.99)
+        metrics[f"{name}.delta_bytes"] = max(sizes)
+    metrics["session.retained_bytes"] = per_session
+    metrics["session.state_bytes"] = state
+    all_timings = [ms for timings, _ in results.values() for ms in timings]
+    metrics["rerun.p50_ms"] = _percentile(all_timings, 0.5)
+    metrics["rerun.p99_ms"] = _percentile(all_timings, 0.99)
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--sessions", type=int, default=20, help="simulated sessions")
+    parser.add_argument("--budgets", default=DEFAULT_BUDGETS, help="JSON file of metric budgets")
+    parser.add_argument("--write-budgets", action="store_true", help="write the measured values plus headroom as the budgets")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Generated notices go to a throwaway archive, not the real one
+        os.environ["NOTICE_ARCHIVE_PATH"] = os.path.join(directory, "archive.sqlite3")
+        os.environ["TRANSLATION_MEMORY_PATH"] = os.path.join(directory, "memory.pickle")
+        metrics = measure(args.sessions)
+        for _ in range(RECORD_RUNS - 1 if args.write_budgets else 0):
+            for name, value in measure(args.sessions).items():
+                metrics[name] = max(metrics[name], value)
+
+    print(f"{'step':<10} {'p50 ms':>8} {'p99 ms':>8} {'delta KB':>9}")
+    for name, _ in FLOW:
+        print(
+            f"{name:<10} {metrics[f'{name}.p50_ms']:>8.1f} {metrics[f'{name}.p99_ms']:>8.1f}"
+            f" {metrics[f'{name}.delta_bytes'] / 1024:>9.1f}"
+        )
+    print(f"all reruns: p50 {metrics['rerun.p50_ms']:.1f} ms, p99 {metrics['rerun.p99_ms']:.1f} ms"
+          f" (about {1000 / metrics['rerun.p50_ms']:.0f} reruns/s per core)")
+    print(f"per session: {metrics['session.retained_bytes'] / 1024:.0f} KB retained,"
+          f" {metrics['session.state_bytes'] / 1024:.1f} KB of session state strings")
+
+    # {"<sessions>": {metric: budget}}
+    all_budgets = {}
+    if os.path.exists(args.budgets):
+        with open(args.budgets, encoding="utf-8") as f:
+            all_budgets = json.load(f)
+    key = str(args.sessions)
+
+    if args.write_budgets:
+        all_budgets[key] = {name: round(value * HEADROOM, 1) for name, value in sorted(metrics.items())}
+        with open(args.budgets, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(all_budgets.items(), key=lambda item: int(item[0]))), f, indent=2)
+            f.write("\n")
+        print(f"budgets for {args.sessions} sessions written to {args.budgets}")
+        return 0
+
+    budgets = all_budgets.get(key)
+    if budgets is None:
+        recorded = ", ".join(sorted(all_budgets, key=int)) or "none"
+        print(
+            f"no budgets for {args.sessions} sessions in {args.budgets} (recorded: {recorded});"
+            f" run with -n {args.sessions} --write-budgets to add them",
+            file=sys.stderr,
+        )
+        return 0
+    over = [
+        f"{name}: {metrics[name]:.1f} > budget {budget}"
+        for name, budget in budgets.items()
+        if name in metrics and metrics[name] > budget
+    ]
+    for line in over:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Search latency of notice_archive.NoticeArchive with many stored notices.
+
+Usage: python benchmarks/bench_archive.py [-n 50000]
+
+Fills a temporary archive with synthetic notices, then times typical
+partial-word queries such as "mainten" (p50/p99 over repeated runs).
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notice_archive import NoticeArchive  # noqa: E402
+from notice_render import render_notice  # noqa: E402
+
+SERVICES = [
+    ("Patents", "Brevets"), ("Trademarks", "Marques de commerce"), ("Industrial designs", "Dessins industriels"),
+    ("Copyrights", "Droits d'auteur"), ("e-commerce", "commerce électronique"), ("MyCIPO", "MonOPIC"),
+]
+REASONS = [
+    ("planned maintenance", "maintenance planifiée"), ("a network outage", "une panne de réseau"),
+    ("a system upgrade", "une mise à niveau du système"), ("unexpected technical issues", "des problèmes techniques imprévus"),
+]
+QUERIES = ["pat", "patents mainten", "marques", "mise à niveau", "outage", "e-commerce unavailable", "z"]
+
+
+def fill(archive, count, seed=1):
+    rng = random.Random(seed)
+    start = date(2010, 1, 1)
+    for i in range(count):
+        (en_service, fr_service), (en_reason, fr_reason) = rng.choice(SERVICES), rng.choice(REASONS)
+        en_title = f"{en_service} online services unavailable"
+        fr_title = f"Services en ligne {fr_service} indisponibles"
+        en_body = f"<p>{en_service} will be unavailable due to {en_reason}. Reference {i}.</p>"
+        fr_body = f"<p>{fr_service} seront indisponibles en raison de {fr_reason}. Référence {i}.</p>"
+        msg_date = start + timedelta(days=i % 6000)
+        notice = render_notice(en_title, fr_title, msg_date, en_body, fr_body)
+        archive.add(en_title, fr_title, msg_date.isoformat(), en_body, fr_body, notice)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--count", type=int, default=50_000, help="notices to store")
+    parser.add_argument("--repeat", type=int, default=50, help="runs per query")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive = NoticeArchive(os.path.join(directory, "archive.sqlite3"))
+        start = time.perf_counter()
+        fill(archive, args.count)
+        print(f"stored {len(archive)} notices in {time.perf_counter() - start:.1f} s")
+
+        print(f"{'query':<24} {'hits':>5} {'p50 ms':>8} {'p99 ms':>8}")
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                begin = time.perf_counter()
+                hits = archive.search(query)
+                timings.append((time.perf_counter() - begin) * 1000)
+            timings.sort()
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            print(f"{query:<24} {len(hits):>5} {timings[len(timings) // 2]:>8.2f} {p99:>8.2f}")
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Micro-benchmark for notice_render.render_notice.
+
+Usage: python benchmarks/bench_render.py [-n 100000]
+
+Reports per-render latency (mean, p50, p99) and allocations per render.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notice_render import render_notice  # noqa: E402
+
+ENGLISH_CONTENT = (
+    "<p>Our online services will be temporarily unavailable due to planned maintenance.</p>"
+    "<ul><li><strong>Patents</strong></li><li>Trademarks</li></ul>"
+)
+FRENCH_CONTENT = (
+    "<p>Nos services en ligne seront temporairement indisponibles en raison d'une maintenance planifiée.</p>"
+    "<ul><li><strong>Brevets</strong></li><li>Marques de commerce</li></ul>"
+)
+
+
+def _notice(i):
+    return (
+        f"Online Services Unavailable #{i}",
+        f"Services en ligne indisponibles no {i}",
+        date(2025, 1 + i % 12, 1 + i % 28),
+        ENGLISH_CONTENT,
+        FRENCH_CONTENT,
+    )
+
+
+def bench_latency(count):
+    timings = []
+    clock = time.perf_counter_ns
+    for i in range(count):
+        args = _notice(i)
+        start = clock()
+        render_notice(*args)
+        timings.append(clock() - start)
+    return timings
+
+
+def bench_allocations(count):
+    notices = [_notice(i) for i in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    # Keep results alive so their size is counted
+    results = [render_notice(*args) for args in notices]
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    allocated = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del results
+    return allocated / count, blocks / count, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--count", type=int, default=100_000, help="number of notices to render")
+    parser.add_argument("--alloc-sample", type=int, default=1_000, help="notices rendered under tracemalloc")
+    args = parser.parse_args(argv)
+
+    timings = bench_latency(args.count)
+    timings.sort()
+    total = sum(timings)
+    print(f"renders:        {args.count}")
+    print(f"total:          {total / 1e9:.3f} s")
+    print(f"mean:           {statistics.fmean(timings) / 1e3:.2f} us")
+    print(f"p50:            {timings[len(timings) // 2] / 1e3:.2f} us")
+    print(f"p99:            {timings[int(len(timings) * 0.99)] / 1e3:.2f} us")
+
+    per_render, blocks, peak = bench_allocations(args.alloc_sample)
+    print(f"retained/render: {per_render:.0f} B in {blocks:.1f} blocks")
+    print(f"peak ({args.alloc_sample} renders): {peak / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
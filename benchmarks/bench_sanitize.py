@@ -0,0 +1,56 @@
+"""Benchmark for quill_sanitizer.sanitize on large pasted content.
+
+Usage: python benchmarks/bench_sanitize.py [--sizes 1 2 4 8]
+
+Builds Word/Outlook-style pasted HTML of each size (in MB) and reports time,
+throughput and byte reduction. Throughput should stay flat as the size grows;
+a drop points to non-linear behaviour.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quill_sanitizer import sanitize  # noqa: E402
+
+PASTED_BLOCK = (
+    '<p class="MsoNormal ql-align-justify"><span lang="EN-CA" style="font-size:11.0pt;'
+    "font-family:&quot;Calibri&quot;,sans-serif;color:#1F497D;mso-fareast-language:EN-US\">"
+    'Our <b><span style="color:black">online services</span></b> will be temporarily '
+    "unavailable&nbsp;due to planned maintenance.<o:p></o:p></span></p>"
+    '<p class="MsoNormal"><span style="font-size:11.0pt"><o:p>&nbsp;</o:p></span></p>'
+    '<p><br></p><p><br></p>'
+    '<ul><li class="ql-indent-1"><span style="color: rgb(0, 0, 0);">Patents</span></li>'
+    '<li><a href="https://ised-isde.canada.ca/" target="_blank" style="color:blue">Trademarks</a></li></ul>'
+    '<!--[if gte mso 9]><xml><o:OfficeDocumentSettings><o:AllowPNG/></o:OfficeDocumentSettings></xml><![endif]-->'
+)
+
+
+def pasted_content(size_mb):
+    repeats = max(1, int(size_mb * 1024 * 1024 / len(PASTED_BLOCK)))
+    return PASTED_BLOCK * repeats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 2, 4, 8], help="input sizes in MB")
+    args = parser.parse_args(argv)
+
+    print(f"{'input':>12} {'output':>12} {'reduction':>10} {'time':>9} {'MB/s':>7}")
+    for size_mb in args.sizes:
+        content = pasted_content(size_mb)
+        before = len(content.encode("utf-8"))
+        start = time.perf_counter()
+        cleaned = sanitize(content)
+        elapsed = time.perf_counter() - start
+        after = len(cleaned.encode("utf-8"))
+        print(
+            f"{before:>12,} {after:>12,} {1 - after / before:>10.1%} "
+            f"{elapsed:>8.3f}s {before / elapsed / 1e6:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Cold-start profile of the guide: import costs and the first rerun.
+
+Usage: python benchmarks/bench_startup.py
+
+Each measurement runs in a fresh interpreter so nothing is already
+imported or cached:
+
+- import time of each of the app's modules on top of streamlit itself
+  (from `python -X importtime`)
+- the first AppTest run of the app on the first wizard step and on the
+  step with the message editor: wall time, and which of the heavy
+  packages in requirements.txt it loaded
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APP_MODULES = [
+    "assets", "guide_steps", "instrumentation", "notice_archive", "notice_render", "page_splicer",
+    "quill_sanitizer", "translation_memory", "streamlit_quill", "jinja2", "PIL.Image",
+]
+HEAVY_PACKAGES = ["streamlit_quill", "jinja2", "PIL", "numpy", "pandas", "pyarrow", "altair", "pydeck"]
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+FIRST_RUN = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+before = set(sys.modules)
+begin = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.session_state["wizard_step"] = {step}
+at.run()
+elapsed = time.perf_counter() - begin
+loaded = sorted({{name.split(".")[0] for name in set(sys.modules) - before}})
+print(json.dumps({{"seconds": elapsed, "loaded": loaded, "exception": bool(at.exception)}}))
+"""
+
+
+def import_cost(module):
+    """Cumulative import time of `module` in ms, with streamlit already imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import streamlit; import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    for line in reversed(result.stderr.splitlines()):
+        match = IMPORT_LINE.search(line)
+        if match and match.group(4) == module and not match.group(3).strip(" "):
+            return int(match.group(2)) / 1000
+    return 0.0  # already imported by streamlit
+
+
+def first_run(step, env):
+    """Wall time and newly imported top-level packages of a cold first run on wizard step `step`."""
+    script = FIRST_RUN.format(app=os.path.join(ROOT, "Service_Interruption_Guide.py"), step=step)
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args(argv)
+    sys.path.insert(0, ROOT)
+    from guide_steps import GUIDE_STEPS
+
+    print(f"{'module':<20} {'import ms':>10}")
+    for module in APP_MODULES:
+        print(f"{module:<20} {import_cost(module):>10.1f}")
+
+    editor_step = next(index for index, step in enumerate(GUIDE_STEPS) if step.tool)
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            PYTHONPATH=ROOT,
+            NOTICE_ARCHIVE_PATH=os.path.join(directory, "archive.sqlite3"),
+            TRANSLATION_MEMORY_PATH=os.path.join(directory, "memory.pickle"),
+        )
+        print()
+        print(f"{'first run':<20} {'seconds':>10}  heavy packages loaded")
+        for label, step in (("first step", 0), ("editor step", editor_step)):
+            run = first_run(step, env)
+            heavy = [name for name in HEAVY_PACKAGES if name in run["loaded"]]
+            error = "  (app raised an exception)" if run["exception"] else ""
+            print(f"{label:<20} {run['seconds']:>10.2f}  {', '.join(heavy) or '-'}{error}")
+
+
+if __name__ == "__main__":
+    main()
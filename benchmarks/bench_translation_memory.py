@@ -0,0 +1,84 @@
+"""Build time, size and lookup latency of translation_memory.TranslationMemory.
+
+Usage: python benchmarks/bench_translation_memory.py [-n 100000]
+
+Indexes synthetic English/French segment pairs, then times suggestions for
+sentences that are near (but not exact) copies of indexed ones (p50/p99).
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation_memory import TranslationMemory, template_segments  # noqa: E402
+
+SERVICES = [
+    ("Patents", "Brevets"), ("Trademarks", "Marques de commerce"), ("Industrial designs", "Dessins industriels"),
+    ("Copyrights", "Droits d'auteur"), ("e-commerce", "commerce électronique"), ("MyCIPO", "MonOPIC"),
+]
+REASONS = [
+    ("planned maintenance", "maintenance planifiée"), ("a network outage", "une panne de réseau"),
+    ("a system upgrade", "une mise à niveau du système"), ("unexpected technical issues", "des problèmes techniques imprévus"),
+]
+DAYS = [("Monday", "lundi"), ("Wednesday", "mercredi"), ("Saturday", "samedi"), ("Sunday", "dimanche")]
+
+
+def segments(count, seed=1):
+    rng = random.Random(seed)
+    yield from template_segments()
+    for i in range(count):
+        (en_service, fr_service), (en_reason, fr_reason) = rng.choice(SERVICES), rng.choice(REASONS)
+        en_day, fr_day = rng.choice(DAYS)
+        hour = rng.randrange(1, 12)
+        yield (
+            f"{en_service} online services will be unavailable on {en_day} from {hour} pm due to {en_reason} {i}.",
+            f"Les services en ligne {fr_service} seront indisponibles le {fr_day} à partir de {hour} h en raison de {fr_reason} {i}.",
+        )
+
+
+QUERIES = [
+    "Patents online services will be unavailable on Sunday from 3 pm due to planned maintenance.",
+    "Our MyCIPO online services are unavailable Saturday due to a network outage.",
+    "We apologize for any inconvenience and appreciate your understanding.",
+    "The quick brown fox jumps over the lazy dog.",
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--count", type=int, default=100_000, help="segment pairs to index")
+    parser.add_argument("--repeat", type=int, default=100, help="runs per query")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    memory = TranslationMemory.build(segments(args.count))
+    print(f"indexed {len(memory)} segments in {time.perf_counter() - start:.1f} s")
+    index_bytes = sum(keys.itemsize * len(keys) + ids.itemsize * len(ids) for keys, ids in zip(memory.band_keys, memory.band_ids))
+    print(f"band arrays: {index_bytes / 1e6:.1f} MB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "memory.pickle")
+        memory.save(path)
+        start = time.perf_counter()
+        memory = TranslationMemory.load(path)
+        print(f"saved file: {os.path.getsize(path) / 1e6:.1f} MB, loaded in {time.perf_counter() - start:.2f} s")
+
+    print(f"{'query':<40} {'score':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    for query in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            begin = time.perf_counter()
+            suggestion = memory.lookup(query)
+            timings.append((time.perf_counter() - begin) * 1000)
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        score = f"{suggestion.score:.2f}" if suggestion else "-"
+        print(f"{query[:40]:<40} {score:>6} {timings[len(timings) // 2]:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark for notice_validator.validate_snippet on generated notices.
+
+Usage: python benchmarks/bench_validator.py [--repeats 1 10 40] [--runs 500]
+
+Renders a notice whose body is the sample content repeated N times and
+reports the time to validate each of its four snippets. The live preview
+validates on every update, so a typical notice (1 repeat) should stay well
+under a millisecond per snippet.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notice_render import render_notice  # noqa: E402
+from notice_validator import FIELD_KINDS, validate_snippet  # noqa: E402
+from quill_sanitizer import sanitize  # noqa: E402
+
+MSG_DATE = "2025-01-31"
+BODY = (
+    "<p>Our online services will be temporarily unavailable due to planned maintenance.</p>"
+    '<ul><li><strong>Patents</strong></li><li><a href="https://ised-isde.canada.ca/">Trademarks</a></li>'
+    "<li>Industrial designs</li></ul>"
+    "<p>We apologize for any inconvenience and appreciate your understanding.</p>"
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, nargs="+", default=[1, 10, 40], help="copies of the sample body")
+    parser.add_argument("--runs", type=int, default=500, help="validations per snippet")
+    args = parser.parse_args(argv)
+
+    print(f"{'repeats':>8} {'snippet':<24} {'bytes':>8} {'problems':>9} {'us':>8}")
+    for repeats in args.repeats:
+        body = sanitize(BODY * repeats)
+        notice = render_notice("Online services unavailable", "Services en ligne indisponibles", MSG_DATE, body, body)
+        for field, kind in FIELD_KINDS.items():
+            markup = getattr(notice, field)
+            problems = validate_snippet(markup, kind, MSG_DATE, budget=float("inf"))
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                validate_snippet(markup, kind, MSG_DATE)
+            elapsed = (time.perf_counter() - start) / args.runs
+            print(
+                f"{repeats:>8} {field:<24} {len(markup.encode('utf-8')):>8,} {len(problems):>9} {elapsed * 1e6:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
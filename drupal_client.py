@@ -0,0 +1,273 @@
+"""Optional backend that saves notices to Drupal without the manual click-through.
+
+For each page and language it opens the node's edit form, inserts the
+snippet at the marker comment (see page_splicer) and saves it with the
+requested moderation state, the same as Steps 4-17 of the guide. The two
+pages are updated concurrently over one pooled session; the translations of
+one page are saved one after the other, since Drupal tracks the changed time
+per node and would reject the second of two concurrent saves. Each update
+is retried with exponential backoff, and every attempt reloads the
+form first. An attempt that finds the snippet already in place, with the
+right state, does nothing, so publishing the same notice twice is safe.
+
+Logging in goes through the department's single sign-on, so the client
+takes the session cookie of a logged-in browser rather than credentials.
+
+Usage:
+    python drupal_client.py notice.jsonl --base-url URL --cookie 'SSESS...=...' --home-nid 1 --state draft
+    python mock_drupal.py &   # local stand-in server for trying this offline
+"""
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import NamedTuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from notice_render import INTERRUPTIONS_PAGE_HREF, RenderedNotice
+from page_splicer import HOME_PAGE, INTERRUPTIONS_PAGE, LANGUAGES, SNIPPET_FIELDS, AnchorNotFoundError, splice
+
+SITE_URL = "https://ised-isde.canada.ca/site/canadian-intellectual-property-office"
+INTERRUPTIONS_NID = int(INTERRUPTIONS_PAGE_HREF.rsplit("/", 1)[1])
+
+DRAFT = "draft"
+PUBLISHED = "published"
+
+BODY_FIELD = "body[0][value]"
+STATE_FIELD = "moderation_state[0][state]"
+SAVE_OP = "Save (this translation)"
+
+# Drupal re-renders the form with this message when the node changed underneath us
+CONFLICT_MESSAGE = "has either been modified by another user"
+
+
+class DrupalError(RuntimeError):
+    """Drupal rejected a request."""
+
+    def __init__(self, message, transient=False):
+        super().__init__(message)
+        self.transient = transient
+
+
+class PageUpdate(NamedTuple):
+    page: str
+    language: str
+    nid: int
+    changed: bool  # False when the page already had the notice and state
+
+
+class EditForm(NamedTuple):
+    action: str
+    fields: dict
+    body: str
+    state: str
+
+
+class _EditFormParser(HTMLParser):
+    """Collect the fields of the node edit form."""
+
+    def __init__(self):
+        super().__init__()
+        self.in_form = False
+        self.action = None
+        self.fields = {}
+        self.textarea = None
+        self.select = None
+        self.errors = []
+        self.in_error = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form" and (attrs.get("id") or "").endswith("edit-form"):
+            self.in_form = True
+            self.action = attrs.get("action")
+        elif tag == "div" and "messages--error" in (attrs.get("class") or ""):
+            self.in_error = True
+        if not self.in_form:
+            return
+        name = attrs.get("name")
+        if tag == "input" and name and attrs.get("type") not in ("submit", "button", "checkbox", "radio"):
+            self.fields[name] = attrs.get("value") or ""
+        elif tag == "input" and name and attrs.get("type") in ("checkbox", "radio") and "checked" in attrs:
+            self.fields[name] = attrs.get("value") or "1"
+        elif tag == "textarea" and name:
+            self.textarea = name
+            self.fields[name] = ""
+        elif tag == "select" and name:
+            self.select = name
+        elif tag == "option" and self.select and "selected" in attrs:
+            self.fields[self.select] = attrs.get("value") or ""
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self.in_form = False
+        elif tag == "textarea":
+            self.textarea = None
+        elif tag == "select":
+            self.select = None
+        elif tag == "div":
+            self.in_error = False
+
+    def handle_data(self, data):
+        if self.textarea:
+            self.fields[self.textarea] += data
+        if self.in_error and data.strip():
+            self.errors.append(data.strip())
+
+
+def _is_transient(error):
+    if isinstance(error, DrupalError):
+        return error.transient
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+class DrupalClient:
+    """Edit and save CIPO pages through Drupal's node edit forms."""
+
+    def __init__(self, base_url=SITE_URL, cookies=None, pool_size=4, timeout=30, attempts=5, backoff=0.5):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if cookies:
+            self.session.cookies.update(cookies)
+        self.pool_size = pool_size
+        # Retry policy for one page update; each attempt reloads the edit form
+        self._retrying = retry(
+            retry=retry_if_exception(_is_transient),
+            wait=wait_exponential(multiplier=backoff, max=8),
+            stop=stop_after_attempt(attempts),
+            reraise=True,
+        )
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def edit_url(self, nid, language):
+        return f"{self.base_url}/{language}/node/{nid}/edit"
+
+    def _check(self, response):
+        if response.status_code == 429 or response.status_code >= 500:
+            raise DrupalError(f"{response.request.method} {response.url}: HTTP {response.status_code}", transient=True)
+        if response.status_code in (401, 403):
+            raise DrupalError(f"{response.url}: not logged in or not allowed (HTTP {response.status_code})")
+        if response.status_code >= 400:
+            raise DrupalError(f"{response.request.method} {response.url}: HTTP {response.status_code}")
+
+    def get_form(self, nid, language):
+        """Load the edit form for one translation of a node."""
+        url = self.edit_url(nid, language)
+        response = self.session.get(url, timeout=self.timeout)
+        self._check(response)
+        parser = _EditFormParser()
+        parser.feed(response.text)
+        parser.close()
+        if BODY_FIELD not in parser.fields:
+            raise DrupalError(f"{url}: no editable body found; is the session logged in?")
+        action = requests.compat.urljoin(url, parser.action) if parser.action else url
+        return EditForm(action, parser.fields, parser.fields[BODY_FIELD], parser.fields.get(STATE_FIELD))
+
+    def save(self, form, body, state):
+        """Submit an edit form with a new body and moderation state."""
+        data = dict(form.fields)
+        data[BODY_FIELD] = body
+        data[STATE_FIELD] = state
+        data["op"] = SAVE_OP
+        response = self.session.post(form.action, data=data, timeout=self.timeout, allow_redirects=False)
+        self._check(response)
+        if response.status_code in (301, 302, 303):
+            return
+        # A successful save redirects; a re-rendered form means it was rejected
+        parser = _EditFormParser()
+        parser.feed(response.text)
+        message = " ".join(parser.errors) or "form was not saved"
+        raise DrupalError(f"{form.action}: {message}", transient=CONFLICT_MESSAGE in message)
+
+    def update_page(self, page, language, nid, snippet, state=DRAFT):
+        """Insert `snippet` into one translation of a page and save it with `state`."""
+
+        @self._retrying
+        def attempt():
+            form = self.get_form(nid, language)
+            result = splice(form.body, snippet, page, name=f"node/{nid} ({language})")
+            if not result.changed and form.state == state:
+                return PageUpdate(page, language, nid, False)
+            self.save(form, result.source, state)
+            return PageUpdate(page, language, nid, True)
+
+        return attempt()
+
+    def update_translations(self, page, nid, notice, state=DRAFT):
+        """Save the notice to each translation of one page, one after the other."""
+        return [
+            self.update_page(page, language, nid, getattr(notice, SNIPPET_FIELDS[(page, language)]), state=state)
+            for language in LANGUAGES
+        ]
+
+    def publish_notice(self, notice, home_nid, state=DRAFT, interruptions_nid=INTERRUPTIONS_NID, pages=None):
+        """Save a RenderedNotice to both pages in both languages.
+
+        The pages are updated concurrently, their translations in turn.
+        `pages` limits the update to some of the pages; by default both the
+        interruptions page and the Home page are updated. Returns the list
+        of PageUpdate results.
+        """
+        nids = {INTERRUPTIONS_PAGE: interruptions_nid, HOME_PAGE: home_nid}
+        pages = pages or (INTERRUPTIONS_PAGE, HOME_PAGE)
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(pages))) as pool:
+            futures = [pool.submit(self.update_translations, page, nids[page], notice, state=state) for page in pages]
+            return [update for future in futures for update in future.result()]
+
+
+def _parse_cookie(value):
+    name, _, cookie = value.partition("=")
+    return {name.strip(): cookie.strip()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Save a generated notice to the CIPO Drupal pages.")
+    parser.add_argument("notice", help="JSON file (or one JSON line from batch_notices.py) with the four snippets")
+    parser.add_argument("--base-url", default=SITE_URL, help=f"site URL (default: {SITE_URL})")
+    parser.add_argument("--cookie", action="append", default=[], help="session cookie NAME=VALUE from a logged-in browser")
+    parser.add_argument("--home-nid", type=int, required=True, help="node id of the Home page")
+    parser.add_argument("--interruptions-nid", type=int, default=INTERRUPTIONS_NID, help="node id of the interruptions page")
+    parser.add_argument("--page", choices=(INTERRUPTIONS_PAGE, HOME_PAGE), action="append", help="only update this page")
+    parser.add_argument("--state", choices=(DRAFT, PUBLISHED), default=DRAFT, help="moderation state to save with")
+    args = parser.parse_args(argv)
+
+    with open(args.notice, encoding="utf-8") as f:
+        record = json.loads(f.readline())
+    notice = RenderedNotice(**{field: record[field] for field in RenderedNotice._fields})
+
+    cookies = {}
+    for value in args.cookie:
+        cookies.update(_parse_cookie(value))
+
+    with DrupalClient(args.base_url, cookies=cookies) as client:
+        try:
+            updates = client.publish_notice(
+                notice, args.home_nid, state=args.state, interruptions_nid=args.interruptions_nid, pages=args.page
+            )
+        except (DrupalError, AnchorNotFoundError) as e:
+            print(e, file=sys.stderr)
+            return 1
+    for update in updates:
+        status = f"saved as {args.state}" if update.changed else "already up to date"
+        print(f"{update.page} ({update.language}), node {update.nid}: {status}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
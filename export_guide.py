@@ -0,0 +1,172 @@
+"""Export the guide's instructions as a standalone HTML page.
+
+The CMS steps and their screenshots never change between sessions, so they
+can be served as a plain static file. Readers who only follow the steps
+then never start a Streamlit session; only the message editor needs the app.
+
+Usage:
+    python export_guide.py -o guide.html                                   # images inlined as data URIs
+    python export_guide.py -o public/guide.html --assets-dir public/img    # images as separate files
+    python export_guide.py -o guide.html --app-url https://tool.example.org/
+
+With --assets-dir each screenshot is written once under a name derived from
+a hash of its bytes, so a web server can cache them forever: a new
+screenshot gets a new name.
+"""
+import argparse
+import base64
+import hashlib
+import html
+import os
+import re
+import struct
+import sys
+
+from jinja2 import Environment
+from markupsafe import Markup
+
+from assets import DEFAULT_WIDTH, STEP_IMAGES, load_asset
+from guide_steps import GUIDE_STEPS
+
+PAGE_TITLE = "Service Interruption Guide"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{{ title }}</title>
+<style>
+body { max-width: 730px; margin: 2rem auto; padding: 0 1rem; font-family: system-ui, sans-serif; line-height: 1.5; color: #262730; }
+img { max-width: 100%; height: auto; }
+figure { margin: 1rem 0; }
+figcaption { color: #6b6f76; font-size: 0.875rem; text-align: center; }
+code { background: #f0f2f6; padding: 0.1em 0.25em; border-radius: 0.25rem; }
+.tool { border: 1px solid #d6d8dd; border-radius: 0.5rem; padding: 0.75rem 1rem; }
+</style>
+</head>
+<body>
+<h1>{{ title }}</h1>
+{% for step in steps %}
+{% if step.separator %}<hr>
+{% endif %}
+{% if step.header %}<h2>{{ step.header }}</h2>
+{% endif %}
+{% if step.intro %}<p>{{ step.intro|markdown }}</p>
+{% endif %}
+<section id="step-{{ loop.index }}">
+<h3>{{ step.title }}</h3>
+{% for paragraph in step.text %}<p>{{ paragraph|markdown }}</p>
+{% endfor %}
+{% if step.tool %}<p class="tool">{% if app_url %}<a href="{{ app_url }}">Open the message tool</a> to create the English and French HTML.{% else %}The message tool is part of the Service Interruption Guide app.{% endif %}</p>
+{% endif %}
+{% for image in step.images %}<figure>
+<img src="{{ image.src }}" alt="{{ image.caption }}"{% if image.size %} width="{{ image.size[0] }}" height="{{ image.size[1] }}"{% endif %} loading="lazy" decoding="async">
+<figcaption>{{ image.caption }}</figcaption>
+</figure>
+{% endfor %}
+{% if step.note %}<p>{{ step.note|markdown }}</p>
+{% endif %}
+</section>
+{% endfor %}
+</body>
+</html>
+"""
+
+# The small subset of markdown the step texts use
+_CODE = re.compile(r"`([^`]+)`")
+_BOLD = re.compile(r"(?<!\*)\*\*([^*\s][^*]*?)\*\*(?!\*)")
+_URL = re.compile(r"https?://[^\s<>()]+[^\s<>().,;:!?'\"]")
+
+
+def _inline(text):
+    text = html.escape(text, quote=False)
+    text = _BOLD.sub(r"<strong>\1</strong>", text)
+    return _URL.sub(lambda match: f'<a href="{match.group(0)}">{match.group(0)}</a>', text)
+
+
+def markdown(text):
+    """Convert one paragraph of the guide's markdown (code spans, bold, bare URLs) to HTML."""
+    parts = []
+    position = 0
+    for match in _CODE.finditer(text):
+        parts.append(_inline(text[position:match.start()]))
+        parts.append(f"<code>{html.escape(match.group(1), quote=False)}</code>")
+        position = match.end()
+    parts.append(_inline(text[position:]))
+    return Markup("".join(parts))
+
+
+_environment = Environment(autoescape=True, trim_blocks=True)
+_environment.filters["markdown"] = markdown
+_page = _environment.from_string(PAGE_TEMPLATE)
+
+
+def png_size(data):
+    """Return (width, height) from a PNG header, or None for anything else."""
+    if data[:8] != b"\x89PNG\r\n\x1a\n" or data[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", data[16:24])
+
+
+def image_source(data, assets_dir=None, base_url=""):
+    """Return the src of an image: a data URI, or a content-hashed file written to `assets_dir`."""
+    if assets_dir is None:
+        return "data:image/png;base64," + base64.b64encode(data).decode("ascii")
+    name = hashlib.sha224(data).hexdigest()[:16] + ".png"
+    path = os.path.join(assets_dir, name)
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(data)
+    return base_url + name
+
+
+def render_guide(width=DEFAULT_WIDTH, assets_dir=None, base_url="", app_url=None):
+    """Return the guide as one HTML page. Missing screenshots are left out with a warning."""
+    steps = []
+    for step in GUIDE_STEPS:
+        images = []
+        for key in step.images:
+            entry = STEP_IMAGES[key]
+            data = load_asset(entry.filename, width)
+            if data is None:
+                print(f"warning: image '{entry.filename}' not found", file=sys.stderr)
+                continue
+            images.append({
+                "src": image_source(data, assets_dir, base_url),
+                "caption": entry.caption,
+                "size": png_size(data),
+            })
+        steps.append(dict(step._asdict(), images=images))
+    return _page.render(title=PAGE_TITLE, steps=steps, app_url=app_url)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the guide's instructions as a standalone HTML page.")
+    parser.add_argument("-o", "--output", default="-", help="HTML file to write (default: stdout)")
+    parser.add_argument("--assets-dir", help="write the screenshots here instead of inlining them")
+    parser.add_argument("--base-url", help="URL of --assets-dir as seen from the page (default: its path relative to the page)")
+    parser.add_argument("--app-url", help="link the message tool step to the running app")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="maximum width of the screenshots in pixels")
+    args = parser.parse_args(argv)
+
+    base_url = args.base_url
+    if args.assets_dir:
+        os.makedirs(args.assets_dir, exist_ok=True)
+        if base_url is None:
+            page_dir = os.path.dirname(os.path.abspath(args.output)) if args.output != "-" else os.getcwd()
+            base_url = os.path.relpath(args.assets_dir, page_dir).replace(os.sep, "/")
+        base_url = base_url.rstrip("/") + "/"
+
+    page = render_guide(args.width, args.assets_dir, base_url or "", args.app_url)
+    if args.output == "-":
+        sys.stdout.write(page)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(page)
+        print(f"wrote {args.output} ({len(page.encode('utf-8')) // 1024} KB)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
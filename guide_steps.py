@@ -0,0 +1,169 @@
+"""The CMS publishing steps of the guide as data.
+
+Each step has a title, text and screenshots. The app either renders them
+all on one page (for printing) or one at a time as a wizard.
+"""
+from typing import NamedTuple
+
+import streamlit as st
+
+from assets import prefetch_step_image, show_step_image
+from instrumentation import section
+
+INTERRUPTIONS_PAGE_URL = "https://ised-isde.canada.ca/site/canadian-intellectual-property-office/en/service-and-website-interruptions"
+
+
+class GuideStep(NamedTuple):
+    title: str
+    text: tuple  # markdown paragraphs, shown in order
+    images: tuple = ()  # keys of assets.STEP_IMAGES, shown after the text
+    note: str = None  # markdown shown after the screenshots
+    header: str = None  # section header shown above the step
+    intro: str = None  # section introduction shown below the header
+    separator: bool = False  # horizontal rule above the step on the full page
+    tool: bool = False  # the message editor and HTML output follow this step
+    snippets: tuple = ()  # RenderedNotice fields the wizard repeats on this step
+
+
+# Every step of the guide, in order. The full page shows them all; the
+# wizard shows one at a time.
+GUIDE_STEPS = (
+    GuideStep(
+        "Step 1: Log into Drupal",
+        (
+            "1) Log into Drupal by clicking the following URL:",
+            "https://ised-isde.canada.ca/site/canadian-intellectual-property-office/en/user/login",
+        ),
+        header="Instructions: Using the Tool and CMS",
+    ),
+    GuideStep(
+        "Step 2: Log into the CMS",
+        ("2) Follow the next steps to correctly log into the Content management system (CMS):",),
+        images=("2a", "2b", "2c"),
+    ),
+    GuideStep(
+        "Step 3: Open the Service Interruption Page",
+        ("3) Once logged in, open the service and website interruptions page:", INTERRUPTIONS_PAGE_URL),
+    ),
+    GuideStep(
+        "Step 4: Confirm Login and go into Edit mode",
+        ("4) Confirm that you are logged in. If you cannot see the 'Edit' button at the top of the page, repeat steps 1 to 3.",),
+        images=("4",),
+    ),
+    GuideStep(
+        "Step 5: Open Source Editor",
+        ("5) Click 'Source' as shown in the image below:",),
+        images=("5",),
+    ),
+    GuideStep(
+        "Step 6: Create Your Message using the tool below",
+        ("6) Create your message using the tools below. Once you have generated the HTML code (English and French) in the 'Generate and Copy HTML Output' section, proceed to Step 7.",),
+        tool=True,
+    ),
+    GuideStep(
+        "Step 7: Paste Full HTML Message into Service Interruption Page Source",
+        ("7) Copy the 'English HTML (Full)' and 'French HTML (Full)' code from the sections above. Paste the **English** code into the English version of the Service Interruption page's Source editor, right where the red line indicates above the commented line of code (in yellow). Please do not modify or delete anything else on the page. Repeat for the **French** code on the French version of the page.",),
+        images=("7",),
+        header="Instructions (Cont.): Applying HTML to CMS - Service Interruption Page",
+        snippets=("english_html", "french_html"),
+    ),
+    GuideStep(
+        "Step 7.1: View Result in CMS",
+        ("7.1) Once you have copy-pasted the full messages HTML code (English and French), click on 'Source' again to view the result. This is how the message will display once you publish the page.",),
+        images=("7.1",),
+    ),
+    GuideStep(
+        "Step 8: Save Service Interruption Page as Draft",
+        ("8) Once satisfied with the message on the Service Interruption page, scroll down and select 'Draft' instead of 'Published'.",),
+        images=("8",),
+    ),
+    GuideStep(
+        "Step 9: Review Service Interruption Page Draft",
+        (
+            "9) Click 'Save (this translation)' and you will be able to review the Draft version of the page. Please note that you also need to review the French version of the page.",
+            "If you need to make changes to the Draft version, go back to Step 4. To share the Draft page for an approval or review, copy the draft URL as indicated in the screenshot below: ",
+        ),
+        images=("9",),
+    ),
+    GuideStep(
+        "Step 10: Publish the Full Message",
+        ("10) Once satisfied with the message on the Service Interruption page and after having reviewed both versions (ENG-FRA), click 'Edit', scroll down, and 'Save as Published' to publish the full message live.",),
+        images=("10",),
+    ),
+    GuideStep(
+        "Step 11: Open the CIPO Home page",
+        ("11) Open the CIPO Home page (https://ised-isde.canada.ca/site/canadian-intellectual-property-office/en) and head into Edit mode.",),
+        images=("11",),
+        header="Instructions: Applying HTML to CMS - Home Page Alert Box",
+        intro=f"Our service interruption message is now published live on the Service and website interruptions page ({INTERRUPTIONS_PAGE_URL}). Now, we need to display a banner message on the Home page to lead users to the full message. The following steps will guide you through publishing this banner on the CIPO Home page. Steps are similar to the previous but detailed below, please follow all steps.",
+        separator=True,
+    ),
+    GuideStep(
+        "Step 12: Open Homepage Source Editor",
+        ("12) Switch the Home page into 'Source' view and find the *****************NOTICES****** line. You will paste the Home page code (Alert Box HTML) below that line as explained in Step 14.",),
+        images=("12",),
+    ),
+    GuideStep(
+        "Step 13: Copy Generated Home page HTML code",
+        ("13) Copy the 'English Home page HTML code' and 'French Home page HTML code' generated in the section above.",),
+        images=("13",),
+        snippets=("english_alert_box_html", "french_alert_box_html"),
+    ),
+    GuideStep(
+        "Step 14: Paste Home page HTML code",
+        ("14) Paste the **English** 'Home page HTML code' exactly here in the Home page Source editor, below the `<!-- *****************NOTICES****** -->` line (make sure to be in Edit mode, as indicated in Step 11). Repeat for the **French** code on the French version of the Home page.",),
+        images=("14",),
+    ),
+    GuideStep(
+        "Step 15: View Result and Save Home page as Draft",
+        ("15) Once you have copy-pasted the Home page HTML code (English and French), click on 'Source' again to view the result. This is how the message will display once you publish the page. Once satisfied with the message, scroll down and select 'Draft' instead of 'Published'.",),
+        images=("15",),
+    ),
+    GuideStep(
+        "Step 16: Review Home page Draft",
+        (
+            "16) Click 'Save (this translation)' and you will be able to review the Draft version of the page. Please note that you also need to review the French version of the page.",
+            "If you need to make changes to the Draft version, go back to Step 11.",
+        ),
+    ),
+    GuideStep(
+        "Step 17: Publish the Home page Alert",
+        ("17) Once satisfied with the message on the Home page and after having reviewed both versions (ENG-FRA), click 'Edit', scroll down, and 'Save as Published' to publish the message live.",),
+        images=("17",),
+        note="The message on the Home page is now live, this short message has a direct link to the full version of the service interruption message.",
+    ),
+    GuideStep(
+        "Final results",
+        (
+            "After publishing the complete message on the Service and website interruptions page and the banner on the CIPO Home page, everything should look like this:",
+        ),
+        images=("final1", "final2"),
+        separator=True,
+    ),
+)
+
+
+def show_step(step, full_page=True):
+    """Render one step: its section header (on the full page), title, text and screenshots."""
+    if full_page and step.separator:
+        st.markdown("---")
+    if step.header:
+        st.header(step.header)
+    if step.intro:
+        st.markdown(step.intro)
+    st.markdown(f"#### {step.title}")
+    for paragraph in step.text:
+        st.markdown(paragraph)
+    if step.images:
+        # e.g. "Step 2 images" is the login screenshots
+        with section(f"{step.title.split(':')[0]} images"):
+            for image in step.images:
+                show_step_image(image)
+    if step.note:
+        st.markdown(step.note)
+
+
+def prefetch_step(step):
+    """Start downloading a step's screenshots before the user gets to it."""
+    for image in step.images:
+        prefetch_step_image(image)
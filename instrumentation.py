@@ -0,0 +1,352 @@
+"""Opt-in timing of the guide's sections: wall time, bytes sent and reruns.
+
+Off unless the GUIDE_METRICS environment variable is set (or
+GUIDE_METRICS_FILE, which also enables it). While it is off, section()
+returns one shared no-op context manager, timed() leaves functions
+undecorated, and the other hooks return at once.
+
+While it is on, every `with section(name):` block records:
+
+- its wall time, in a Prometheus histogram
+- the bytes of the messages it sends to the browser (ForwardMsg deltas,
+  counted where the script run context enqueues them)
+- media bytes reported inside the block through add_media_bytes(), for
+  images that are served separately from the deltas
+
+begin_rerun()/end_rerun() count full script reruns per session. After each
+rerun the Prometheus text exposition is written to GUIDE_METRICS_FILE when
+that is set. show_debug_panel() draws this session's numbers in the app.
+
+Serving the file to Prometheus:
+    GUIDE_METRICS_FILE=/tmp/guide.prom streamlit run Service_Interruption_Guide.py
+    python instrumentation.py serve --file /tmp/guide.prom --port 9108
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import wraps
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+METRICS_FILE = os.environ.get("GUIDE_METRICS_FILE")
+ENABLED = bool(os.environ.get("GUIDE_METRICS") or METRICS_FILE)
+
+# Upper bounds of the wall-time histogram buckets, in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+MAX_SESSIONS = 256  # per-session rerun counts kept for the most recent sessions
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class SectionStats:
+    """Totals for one section, either process-wide or for one session."""
+
+    __slots__ = ("calls", "seconds", "delta_bytes", "media_bytes", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.delta_bytes = 0
+        self.media_bytes = 0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, seconds, delta_bytes, media_bytes):
+        self.calls += 1
+        self.seconds += seconds
+        self.delta_bytes += delta_bytes
+        self.media_bytes += media_bytes
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+
+class SessionStats:
+    __slots__ = ("reruns", "emitted", "media", "sections", "rerun_started")
+
+    def __init__(self):
+        self.reruns = 0
+        self.emitted = 0  # running total of ForwardMsg bytes sent to this session
+        self.media = 0  # running total of media bytes served to this session
+        self.sections = {}
+        self.rerun_started = None
+
+
+class Registry:
+    """Process-wide metrics, shared by every session of the app."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sections = {}
+        self.sessions = OrderedDict()
+
+    def session(self, session_id):
+        with self.lock:
+            stats = self.sessions.get(session_id)
+            if stats is None:
+                stats = self.sessions[session_id] = SessionStats()
+                while len(self.sessions) > MAX_SESSIONS:
+                    self.sessions.popitem(last=False)
+            return stats
+
+    def record(self, session, name, seconds, delta_bytes, media_bytes):
+        with self.lock:
+            for sections in (self.sections, session.sections):
+                stats = sections.get(name)
+                if stats is None:
+                    stats = sections[name] = SectionStats()
+                stats.add(seconds, delta_bytes, media_bytes)
+
+    def exposition(self):
+        """Return the metrics in the Prometheus text format."""
+        lines = [
+            "# HELP guide_section_seconds Wall time of an instrumented section of the guide.",
+            "# TYPE guide_section_seconds histogram",
+        ]
+        with self.lock:
+            sections = sorted(self.sections.items())
+            for name, stats in sections:
+                label = _label(name)
+                cumulative = 0
+                for bound, count in zip(BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f'guide_section_seconds_bucket{{section="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'guide_section_seconds_bucket{{section="{label}",le="+Inf"}} {stats.calls}')
+                lines.append(f'guide_section_seconds_sum{{section="{label}"}} {stats.seconds:.6f}')
+                lines.append(f'guide_section_seconds_count{{section="{label}"}} {stats.calls}')
+            lines += [
+                "# HELP guide_section_delta_bytes_total Bytes of messages a section sent to the browser.",
+                "# TYPE guide_section_delta_bytes_total counter",
+            ]
+            lines += [f'guide_section_delta_bytes_total{{section="{_label(name)}"}} {stats.delta_bytes}' for name, stats in sections]
+            lines += [
+                "# HELP guide_section_media_bytes_total Bytes of images a section served.",
+                "# TYPE guide_section_media_bytes_total counter",
+            ]
+            lines += [f'guide_section_media_bytes_total{{section="{_label(name)}"}} {stats.media_bytes}' for name, stats in sections]
+            lines += [
+                "# HELP guide_reruns_total Full script reruns per session.",
+                "# TYPE guide_reruns_total counter",
+            ]
+            lines += [f'guide_reruns_total{{session="{_label(session_id)}"}} {stats.reruns}' for session_id, stats in self.sessions.items()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _current_session():
+    """Return the SessionStats of the running script, counting the bytes it sends from then on."""
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return None
+    stats = getattr(ctx, "_guide_metrics", None)
+    if stats is None:
+        stats = ctx._guide_metrics = REGISTRY.session(ctx.session_id)
+        enqueue = ctx._enqueue
+
+        def counting_enqueue(msg):
+            stats.emitted += msg.ByteSize()
+            enqueue(msg)
+
+        ctx._enqueue = counting_enqueue
+    return stats
+
+
+class _Section:
+    __slots__ = ("name", "session", "start", "emitted", "media")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.session = _current_session()
+        if self.session is not None:
+            self.emitted = self.session.emitted
+            self.media = self.session.media
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        if self.session is not None:
+            REGISTRY.record(
+                self.session, self.name, seconds, self.session.emitted - self.emitted, self.session.media - self.media
+            )
+        return False
+
+
+class _NoOpSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_OP = _NoOpSection()
+
+
+def section(name):
+    """Context manager that measures a block of the script under `name`."""
+    if not ENABLED:
+        return _NO_OP
+    return _Section(name)
+
+
+def add_media_bytes(count):
+    """Count `count` bytes of media (images) served, in every section currently open."""
+    if not ENABLED:
+        return
+    stats = _current_session()
+    if stats is not None:
+        stats.media += count
+
+
+def timed(name):
+    """Decorator form of section(); leaves the function untouched when instrumentation is off."""
+
+    def decorate(function):
+        if not ENABLED:
+            return function
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with _Section(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def begin_rerun():
+    """Call at the top of the script."""
+    if not ENABLED:
+        return
+    stats = _current_session()
+    if stats is not None:
+        stats.reruns += 1
+        stats.rerun_started = (time.perf_counter(), stats.emitted, stats.media)
+
+
+def end_rerun():
+    """Call at the bottom of the script: records the whole rerun and writes the metrics file."""
+    if not ENABLED:
+        return
+    stats = _current_session()
+    if stats is not None and stats.rerun_started is not None:
+        started, emitted, media = stats.rerun_started
+        REGISTRY.record(stats, "rerun", time.perf_counter() - started, stats.emitted - emitted, stats.media - media)
+        stats.rerun_started = None
+    if METRICS_FILE:
+        try:
+            write_metrics(METRICS_FILE)
+        except OSError as e:
+            # A missing metrics file must never break the page
+            print(f"instrumentation: could not write {METRICS_FILE}: {e}", file=sys.stderr)
+
+
+def write_metrics(path):
+    """Atomically replace `path` with the current Prometheus exposition.
+
+    Safe to call from several sessions (threads) and processes at once: each
+    call writes its own temporary file next to `path`.
+    """
+    descriptor, temporary = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(path) or "."
+    )
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            f.write(REGISTRY.exposition())
+        # mkstemp creates the file readable by its owner only
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def show_debug_panel():
+    """Draw this session's section timings, if instrumentation is on."""
+    if not ENABLED:
+        return
+    stats = _current_session()
+    if stats is None:
+        return
+    with st.expander("Debug: performance of this session"):
+        st.caption(
+            f"{stats.reruns} full reruns. Times include everything nested in a section;"
+            " the rerun drawing this panel is counted once it finishes."
+        )
+        with REGISTRY.lock:
+            rows = [
+                {
+                    "section": name,
+                    "calls": section_stats.calls,
+                    "total ms": round(section_stats.seconds * 1000, 1),
+                    "mean ms": round(section_stats.seconds * 1000 / section_stats.calls, 2),
+                    "delta KB": round(section_stats.delta_bytes / 1024, 1),
+                    "media KB": round(section_stats.media_bytes / 1024, 1),
+                }
+                for name, section_stats in sorted(stats.sections.items(), key=lambda item: -item[1].seconds)
+            ]
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+        st.download_button("Download Prometheus metrics", REGISTRY.exposition(), file_name="guide.prom", mime="text/plain")
+
+
+def serve(path, host="0.0.0.0", port=9108):
+    """Serve the metrics file at /metrics for Prometheus to scrape."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = b""
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving {path} on http://{host}:{port}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the guide's metrics file to Prometheus.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="serve GUIDE_METRICS_FILE at /metrics")
+    serve_parser.add_argument("--file", default=METRICS_FILE, required=METRICS_FILE is None, help="metrics file written by the app")
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=9108)
+    args = parser.parse_args(argv)
+    serve(args.file, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
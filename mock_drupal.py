@@ -0,0 +1,224 @@
+"""Local stand-in for the Drupal node edit/save endpoints.
+
+Serves GET and POST on /{language}/node/{nid}/edit with a form shaped like
+Drupal's: hidden form_build_id/form_token/changed fields, the body textarea
+and the moderation state select. A save redirects on success. A stale
+"changed" value re-renders the form with Drupal's conflict message; as in
+Drupal, the changed time belongs to the node, so saving one translation
+makes an open form of the other translation stale. It can also be told to
+fail the next few requests, to exercise retries.
+
+Usage:
+    python mock_drupal.py --port 8765
+    python drupal_client.py notice.jsonl --base-url http://127.0.0.1:8765 --home-nid 1
+
+or in-process:
+    with MockDrupal() as server:
+        DrupalClient(server.url).publish_notice(notice, home_nid=server.home_nid)
+"""
+import argparse
+import html
+import re
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from drupal_client import BODY_FIELD, CONFLICT_MESSAGE, DRAFT, INTERRUPTIONS_NID, PUBLISHED, STATE_FIELD
+
+HOME_NID = 1
+
+# Page sources as they look before any notice is added
+INITIAL_BODIES = {
+    INTERRUPTIONS_NID: {
+        "en": (
+            "<p>A list of service and website interruptions at the Canadian Intellectual Property Office (CIPO).\n</p>\n"
+            "<!-- ENTER THE HTML CODE FOR NEW MESSAGE BELOW THIS LINE, DO NOT DELETE THIS COMMENT -->\n"
+        ),
+        "fr": (
+            "<p>Liste des interruptions des services et de l'accès au site Web de l'Office de la propriété "
+            "intellectuelle du Canada (OPIC).\n</p>\n"
+            "<!-- ENTER THE HTML CODE FOR NEW MESSAGE BELOW THIS LINE, DO NOT DELETE THIS COMMENT -->\n"
+        ),
+    },
+    HOME_NID: {
+        "en": '<div class="row">\n</div>\n<!-- *****************NOTICES****** -->\n<drupal-entity></drupal-entity>\n',
+        "fr": '<div class="row">\n</div>\n<!-- *****************NOTICES****** -->\n<drupal-entity></drupal-entity>\n',
+    },
+}
+
+EDIT_PATH = re.compile(r"^/(en|fr)/node/(\d+)/edit$")
+
+FORM_TEMPLATE = """<!DOCTYPE html>
+<html><body>
+{messages}
+<form id="node-page-edit-form" action="/{language}/node/{nid}/edit" method="post">
+<input type="hidden" name="changed" value="{changed}">
+<input type="hidden" name="form_build_id" value="{form_build_id}">
+<input type="hidden" name="form_token" value="{form_token}">
+<input type="hidden" name="form_id" value="node_page_edit_form">
+<input type="text" name="title[0][value]" value="{title}">
+<textarea name="body[0][value]">{body}</textarea>
+<select name="moderation_state[0][state]">
+<option value="draft"{draft_selected}>Draft</option>
+<option value="published"{published_selected}>Published</option>
+</select>
+<input type="submit" name="op" value="Save (this translation)">
+</form>
+</body></html>
+"""
+
+
+class MockDrupal:
+    """In-memory Drupal with the CIPO interruptions and Home pages."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.lock = threading.Lock()
+        self.token = secrets.token_urlsafe(16)
+        self.nodes = {
+            nid: {
+                language: {"body": body, "state": PUBLISHED, "saves": 0}
+                for language, body in translations.items()
+            }
+            for nid, translations in INITIAL_BODIES.items()
+        }
+        # Last change of each node, whichever translation was saved
+        self.changed = {nid: 1 for nid in INITIAL_BODIES}
+        self.home_nid = HOME_NID
+        self.interruptions_nid = INTERRUPTIONS_NID
+        self.fail_next = 0
+        self.requests = 0
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def render_form(self, nid, language, messages=""):
+        node = self.nodes[nid][language]
+        return FORM_TEMPLATE.format(
+            messages=messages,
+            language=language,
+            nid=nid,
+            changed=self.changed[nid],
+            form_build_id="form-" + secrets.token_urlsafe(8),
+            form_token=self.token,
+            title=html.escape(f"Node {nid}"),
+            body=html.escape(node["body"], quote=False),
+            draft_selected=" selected" if node["state"] == DRAFT else "",
+            published_selected=" selected" if node["state"] == PUBLISHED else "",
+        )
+
+    def save(self, nid, language, fields):
+        """Apply a submitted form; return an error message or None."""
+        node = self.nodes[nid][language]
+        if fields.get("form_token") != self.token:
+            return "The form has become outdated."
+        if fields.get("changed") != str(self.changed[nid]):
+            return f"The content {CONFLICT_MESSAGE}, or you have already submitted modifications."
+        if fields.get(STATE_FIELD) not in (DRAFT, PUBLISHED):
+            return "Invalid moderation state."
+        node["body"] = fields.get(BODY_FIELD, "")
+        node["state"] = fields[STATE_FIELD]
+        self.changed[nid] += 1
+        node["saves"] += 1
+        return None
+
+    def _handler_class(self):
+        drupal = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _route(self):
+                match = EDIT_PATH.match(self.path)
+                if match is None or int(match.group(2)) not in drupal.nodes:
+                    self._send(404, "Not found")
+                    return None
+                with drupal.lock:
+                    drupal.requests += 1
+                    if drupal.fail_next:
+                        drupal.fail_next -= 1
+                        self._send(503, "Service unavailable")
+                        return None
+                return match.group(1), int(match.group(2))
+
+            def _send(self, status, body, headers=()):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                route = self._route()
+                if route is None:
+                    return
+                language, nid = route
+                with drupal.lock:
+                    page = drupal.render_form(nid, language)
+                self._send(200, page)
+
+            def do_POST(self):
+                route = self._route()
+                if route is None:
+                    return
+                language, nid = route
+                length = int(self.headers.get("Content-Length", 0))
+                fields = {
+                    name: values[0]
+                    for name, values in parse_qs(self.rfile.read(length).decode("utf-8"), keep_blank_values=True).items()
+                }
+                with drupal.lock:
+                    error = drupal.save(nid, language, fields)
+                    if error:
+                        page = drupal.render_form(
+                            nid, language, f'<div class="messages messages--error">{html.escape(error)}</div>'
+                        )
+                if error:
+                    self._send(200, page)
+                else:
+                    self._send(303, "", headers=[("Location", f"/{language}/node/{nid}")])
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Drupal node edit endpoints.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    server = MockDrupal(args.host, args.port)
+    print(f"Mock Drupal on {server.url} (interruptions node {server.interruptions_nid}, Home node {server.home_nid})")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Local archive of generated notices with full-text search.
+
+Every notice pair generated in the app is stored in a SQLite database
+together with its rendered HTML, so past messages can be found and loaded
+back into the form. Titles and the plain text of both bodies are indexed
+with FTS5. The index uses prefix tables so a partly typed word stays a
+fast index lookup even with tens of thousands of notices.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from html import unescape
+from typing import NamedTuple
+
+DEFAULT_PATH = os.environ.get(
+    "NOTICE_ARCHIVE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "notice_archive.sqlite3"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notices (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE,
+    en_title TEXT NOT NULL,
+    fr_title TEXT NOT NULL,
+    date_iso TEXT NOT NULL,
+    en_body TEXT NOT NULL,
+    fr_body TEXT NOT NULL,
+    english_html TEXT NOT NULL,
+    french_html TEXT NOT NULL,
+    english_alert_box_html TEXT NOT NULL,
+    french_alert_box_html TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notices_date ON notices (date_iso);
+CREATE VIRTUAL TABLE IF NOT EXISTS notices_fts USING fts5(
+    en_title, fr_title, en_text, fr_text,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+"""
+
+_TAG = re.compile(r"<[^>]*>")
+_WORD = re.compile(r"\w+")
+
+
+class NoticeSummary(NamedTuple):
+    id: int
+    en_title: str
+    fr_title: str
+    date_iso: str
+
+
+class ArchivedNotice(NamedTuple):
+    id: int
+    en_title: str
+    fr_title: str
+    date_iso: str
+    en_body: str
+    fr_body: str
+    english_html: str
+    french_html: str
+    english_alert_box_html: str
+    french_alert_box_html: str
+    created_at: str
+
+
+def _text(body):
+    return unescape(_TAG.sub(" ", body or ""))
+
+
+def _match_query(query):
+    """Turn what the user typed into an FTS5 query: every word, the last one as a prefix."""
+    words = _WORD.findall(query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words[:-1]]
+    terms.append(f'"{words[-1]}"*')
+    return " ".join(terms)
+
+
+class NoticeArchive:
+    """SQLite store of generated notices. Safe to share between Streamlit sessions."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def add(self, en_title, fr_title, date_iso, en_body, fr_body, notice):
+        """Store a notice and its RenderedNotice; return its id.
+
+        Storing the same inputs again returns the existing id.
+        """
+        digest = hashlib.sha256(
+            "\0".join((en_title, fr_title, date_iso, en_body or "", fr_body or "")).encode("utf-8")
+        ).hexdigest()
+        with self.lock, self.connection:
+            row = self.connection.execute("SELECT id FROM notices WHERE digest = ?", (digest,)).fetchone()
+            if row:
+                return row[0]
+            cursor = self.connection.execute(
+                "INSERT INTO notices (digest, en_title, fr_title, date_iso, en_body, fr_body, english_html,"
+                " french_html, english_alert_box_html, french_alert_box_html, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    digest, en_title, fr_title, date_iso, en_body or "", fr_body or "", *notice,
+                    datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                ),
+            )
+            notice_id = cursor.lastrowid
+            self.connection.execute(
+                "INSERT INTO notices_fts (rowid, en_title, fr_title, en_text, fr_text) VALUES (?, ?, ?, ?, ?)",
+                (notice_id, en_title, fr_title, _text(en_body), _text(fr_body)),
+            )
+            return notice_id
+
+    def search(self, query, limit=10):
+        """Return up to `limit` NoticeSummary matches, most recently stored first.
+
+        An empty query lists the notices with the latest dates.
+        """
+        match = _match_query(query)
+        with self.lock:
+            if match is None:
+                rows = self.connection.execute(
+                    "SELECT id, en_title, fr_title, date_iso FROM notices ORDER BY date_iso DESC, id DESC LIMIT ?",
+                    (limit,),
+                ).fetchall()
+            else:
+                # Newest first: FTS5 walks rowids in descending order and stops at
+                # the limit, where ranking by bm25 would score every match
+                rows = self.connection.execute(
+                    "SELECT n.id, n.en_title, n.fr_title, n.date_iso FROM"
+                    " (SELECT rowid FROM notices_fts WHERE notices_fts MATCH ? ORDER BY rowid DESC LIMIT ?) AS hits"
+                    " JOIN notices AS n ON n.id = hits.rowid ORDER BY n.id DESC",
+                    (match, limit),
+                ).fetchall()
+        return [NoticeSummary(*row) for row in rows]
+
+    def get(self, notice_id):
+        """Return the ArchivedNotice with this id, or None."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT id, en_title, fr_title, date_iso, en_body, fr_body, english_html, french_html,"
+                " english_alert_box_html, french_alert_box_html, created_at FROM notices WHERE id = ?",
+                (notice_id,),
+            ).fetchone()
+        return ArchivedNotice(*row) if row else None
+
+    def pairs(self, start=0):
+        """Return (en_title, fr_title, en_body, fr_body) for every stored notice, oldest first.
+
+        `start` skips that many of the oldest notices.
+        """
+        with self.lock:
+            return self.connection.execute(
+                "SELECT en_title, fr_title, en_body, fr_body FROM notices ORDER BY id LIMIT -1 OFFSET ?", (start,)
+            ).fetchall()
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT count(*) FROM notices").fetchone()[0]
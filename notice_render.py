@@ -0,0 +1,99 @@
+"""Rendering of the four service interruption HTML snippets.
+
+This module has no Streamlit dependency so the same markup can be produced
+from the app, from scripts and from benchmarks.
+"""
+import html
+from typing import NamedTuple
+
+from jinja2 import Environment
+
+SITE_ROOT = "/site/canadian-intellectual-property-office"
+
+# Drupal node links used in the generated markup
+CLIENT_SERVICE_CENTRE_UUID = "78a10a22-8b11-4c4e-bef2-5c37808ebaba"
+CLIENT_SERVICE_CENTRE_HREF = f"{SITE_ROOT}/node/13"
+CORRESPONDENCE_PROCEDURES_UUID = "d0a59429-cdb8-4122-b2b0-6167cf90e56b"
+CORRESPONDENCE_PROCEDURES_HREF = f"{SITE_ROOT}/node/133"
+# The UUID fb66b1c4-e3c7-490a-9e61-dd2436a8bc90 seems to be specific to the page linking to the full message (node/28)
+INTERRUPTIONS_PAGE_UUID = "fb66b1c4-e3c7-490a-9e61-dd2436a8bc90"
+INTERRUPTIONS_PAGE_HREF = f"{SITE_ROOT}/node/28"
+
+
+def _node_link(uuid, href, text):
+    return (
+        f'<a data-entity-substitution="canonical" data-entity-type="node" '
+        f'data-entity-uuid="{uuid}" href="{href}">{text}</a>'
+    )
+
+
+ENGLISH_FOOTER = (
+    "<p>For more information, please contact our "
+    f"{_node_link(CLIENT_SERVICE_CENTRE_UUID, CLIENT_SERVICE_CENTRE_HREF, 'Client Service Centre')}. "
+    "For date-sensitive material, please review our "
+    f"{_node_link(CORRESPONDENCE_PROCEDURES_UUID, CORRESPONDENCE_PROCEDURES_HREF, 'Correspondence Procedures')}.</p>"
+)
+FRENCH_FOOTER = (
+    "<p>Pour de plus amples renseignements, veuillez communiquer avec notre "
+    f"{_node_link(CLIENT_SERVICE_CENTRE_UUID, CLIENT_SERVICE_CENTRE_HREF, 'Centre de services à la clientèle')}. "
+    "Pour les demandes assorties de délais, veuillez consulter les "
+    f"{_node_link(CORRESPONDENCE_PROCEDURES_UUID, CORRESPONDENCE_PROCEDURES_HREF, 'Procédures relatives à la correspondance')}.</p>"
+)
+
+ENGLISH_ALERT_PREFIX = "Service interruption"
+FRENCH_ALERT_PREFIX = "Interruption des services"
+
+FULL_MESSAGE_TEMPLATE = """
+<h2 class="text-danger">{{ title|escape_title }} &ndash; (<time class="nowrap" datetime="{{ date_iso }}">{{ date_iso }}</time>)</h2>
+{{ content }}
+{{ footer }}
+"""
+
+ALERT_BOX_TEMPLATE = """
+<div class="alert alert-warning col-md-12 mrgn-bttm-sm activeNotice">
+  <p><a data-entity-substitution="canonical" data-entity-type="node" data-entity-uuid="{{ page_uuid }}" href="{{ page_href }}"><span class="text-danger"><strong>{{ prefix }} - {{ title|escape_title }} - (<time class="nowrap" datetime="{{ date_iso }}">{{ date_iso }}</time>)</strong></span></a>
+  </p>
+</div>
+"""
+
+# Autoescaping stays off: the editor content is already HTML. Titles go through
+# html.escape rather than Jinja's escape so the entities match what the tool
+# has always produced (e.g. &#x27; rather than &#39;).
+_environment = Environment(autoescape=False, keep_trailing_newline=True)
+_environment.filters["escape_title"] = html.escape
+
+# Compiled once at import; rendering only runs the generated Python code.
+_full_message = _environment.from_string(FULL_MESSAGE_TEMPLATE)
+_alert_box = _environment.from_string(ALERT_BOX_TEMPLATE)
+
+
+class RenderedNotice(NamedTuple):
+    english_html: str
+    french_html: str
+    english_alert_box_html: str
+    french_alert_box_html: str
+
+
+def render_notice(english_title, french_title, msg_date, english_content, french_content):
+    """Render the full messages and Home page alert boxes for one notice.
+
+    `msg_date` is a date (or an ISO "YYYY-MM-DD" string). Titles are escaped;
+    the content is inserted as-is since it is HTML from the editor.
+    """
+    date_iso = msg_date if isinstance(msg_date, str) else msg_date.strftime('%Y-%m-%d')
+    return RenderedNotice(
+        english_html=_full_message.render(
+            title=english_title, date_iso=date_iso, content=english_content, footer=ENGLISH_FOOTER
+        ),
+        french_html=_full_message.render(
+            title=french_title, date_iso=date_iso, content=french_content, footer=FRENCH_FOOTER
+        ),
+        english_alert_box_html=_alert_box.render(
+            title=english_title, date_iso=date_iso, prefix=ENGLISH_ALERT_PREFIX,
+            page_uuid=INTERRUPTIONS_PAGE_UUID, page_href=INTERRUPTIONS_PAGE_HREF,
+        ),
+        french_alert_box_html=_alert_box.render(
+            title=french_title, date_iso=date_iso, prefix=FRENCH_ALERT_PREFIX,
+            page_uuid=INTERRUPTIONS_PAGE_UUID, page_href=INTERRUPTIONS_PAGE_HREF,
+        ),
+    )
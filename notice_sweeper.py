@@ -0,0 +1,267 @@
+"""Find and remove expired notices from a saved page source.
+
+The generator writes two kinds of notice blocks:
+- alert boxes on the Home page: <div class="alert ... activeNotice">...</div>
+- full messages on the interruptions page: <h2 class="text-danger"> followed
+  by the message body, up to the end of its "For more information" footer
+  paragraph. A message without that footer ends at the next <h2>, at the
+  first following element that cannot be message body, or at the end of the
+  enclosing element.
+
+Both carry <time datetime="YYYY-MM-DD">. index_notices() finds every block in
+one pass with html.parser and records its byte offsets, date and language;
+prune() cuts the blocks older than a cutoff out of the source in one more
+linear pass, optionally keeping them for an archive.
+
+Usage:
+    python notice_sweeper.py page.html                      # list notices
+    python notice_sweeper.py page.html --before 2025-01-01 -o pruned.html --archive old.html
+"""
+import argparse
+import sys
+from datetime import date
+from html.parser import HTMLParser
+from typing import NamedTuple
+
+from notice_render import CLIENT_SERVICE_CENTRE_UUID, ENGLISH_ALERT_PREFIX, FRENCH_ALERT_PREFIX
+from quill_sanitizer import ALLOWED_TAGS
+
+ALERT_BOX = "alert"
+FULL_MESSAGE = "full"
+
+# Start of the footer paragraph that ends every generated full message; the
+# paragraph also links to the Client Service Centre node
+ENGLISH_FOOTER_MARKER = "For more information"
+FRENCH_FOOTER_MARKER = "Pour de plus amples renseignements"
+
+# Text that identifies a block's language
+LANGUAGE_MARKERS = (
+    (ENGLISH_ALERT_PREFIX, "en"),
+    (FRENCH_ALERT_PREFIX, "fr"),
+    (ENGLISH_FOOTER_MARKER, "en"),
+    (FRENCH_FOOTER_MARKER, "fr"),
+)
+
+# Elements a message body can hold; any other element next to the message
+# (e.g. the page's own <div>s) is not part of it
+BODY_TAGS = set(ALLOWED_TAGS)
+
+_WHITESPACE = b" \t\r\n"
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+class NoticeBlock(NamedTuple):
+    kind: str
+    start: int  # byte offset of the block in the UTF-8 source
+    end: int  # byte offset just past the block
+    date_iso: str  # None if the block has no <time datetime>
+    language: str  # "en", "fr" or the page default
+
+
+class PruneResult(NamedTuple):
+    source: str
+    removed: list  # NoticeBlock for each block taken out
+    archived: str  # HTML of the removed blocks, in page order
+
+
+class _NoticeIndexer(HTMLParser):
+    def __init__(self, text, default_language):
+        super().__init__(convert_charrefs=False)
+        self.text = text
+        self.default_language = default_language
+        # Absolute offset of the start of each line, for getpos()
+        self.line_starts = [0]
+        find = text.find
+        newline = find("\n")
+        while newline != -1:
+            self.line_starts.append(newline + 1)
+            newline = find("\n", newline + 1)
+        self.blocks = []
+        self.depth = 0
+        # Current alert box: [start, depth of its div, date, language]
+        self.alert = None
+        # Current full message: [start, depth of its parent, date, language]
+        self.full = None
+        self.in_full_heading = False
+        # State of the current top-level paragraph of a full message: None before
+        # its first text, then whether it starts like the footer, and whether it
+        # holds the footer's node link
+        self.footer_text = None
+        self.footer_link = False
+
+    def _offset(self):
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def _finish_full(self, end):
+        start, _, date_iso, language = self.full
+        # The block ends with its last tag, not with the whitespace before the next one
+        while end > start and self.text[end - 1] in " \t\r\n":
+            end -= 1
+        self.blocks.append(NoticeBlock(FULL_MESSAGE, start, end, date_iso, language or self.default_language))
+        self.full = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.full is not None and self.depth == self.full[1] and tag != "h2":
+            # An element of the message body, or the first thing after the message
+            if tag not in BODY_TAGS:
+                self._finish_full(self._offset())
+            else:
+                self.footer_text = None
+                self.footer_link = False
+        if tag == "h2" and self.alert is None:
+            offset = self._offset()
+            if self.full is not None:
+                self._finish_full(offset)
+            classes = (dict(attrs).get("class") or "").split()
+            if "text-danger" in classes:
+                self.full = [offset, self.depth, None, None]
+                self.in_full_heading = True
+                self.footer_text = False
+        elif tag == "div" and self.alert is None:
+            classes = (dict(attrs).get("class") or "").split()
+            if "activeNotice" in classes:
+                self.alert = [self._offset(), self.depth, None, None]
+        elif tag == "a" and self.footer_text:
+            self.footer_link = self.footer_link or dict(attrs).get("data-entity-uuid") == CLIENT_SERVICE_CENTRE_UUID
+        elif tag == "time":
+            current = self.alert or (self.full if self.in_full_heading else None)
+            if current is not None and current[2] is None:
+                current[2] = dict(attrs).get("datetime")
+        if tag not in VOID_TAGS:
+            self.depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.depth -= 1
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        self.depth -= 1
+        if tag == "h2":
+            self.in_full_heading = False
+        if self.alert is not None and tag == "div" and self.depth == self.alert[1]:
+            start, _, date_iso, language = self.alert
+            end = self.text.find(">", self._offset()) + 1
+            self.blocks.append(NoticeBlock(ALERT_BOX, start, end, date_iso, language or self.default_language))
+            self.alert = None
+        elif self.full is not None and self.depth < self.full[1]:
+            # The element holding the message closed
+            self._finish_full(self._offset())
+        elif self.full is not None and self.footer_link and tag == "p" and self.depth == self.full[1]:
+            # The footer paragraph is the last part of a generated message
+            self._finish_full(self.text.find(">", self._offset()) + 1)
+
+    def handle_comment(self, data):
+        # The "ENTER THE HTML CODE ..." marker separates new messages from old ones
+        if self.full is not None and "ENTER THE HTML CODE" in data:
+            self._finish_full(self._offset())
+
+    def handle_data(self, data):
+        if self.full is not None and self.footer_text is None and data.strip():
+            self.footer_text = data.lstrip().startswith((ENGLISH_FOOTER_MARKER, FRENCH_FOOTER_MARKER))
+        current = self.alert or self.full
+        if current is not None and current[3] is None:
+            for marker, language in LANGUAGE_MARKERS:
+                if marker in data:
+                    current[3] = language
+                    break
+
+    def result(self):
+        self.close()
+        if self.alert is not None:
+            # Unclosed alert box: it runs to the end of the page
+            start, _, date_iso, language = self.alert
+            self.blocks.append(NoticeBlock(ALERT_BOX, start, len(self.text), date_iso, language or self.default_language))
+        if self.full is not None:
+            self._finish_full(len(self.text))
+        self.blocks.sort(key=lambda block: block.start)
+        return self.blocks
+
+
+def _as_bytes(source):
+    return source.encode("utf-8") if isinstance(source, str) else source
+
+
+def index_notices(source, default_language=None):
+    """Return a NoticeBlock for every generated notice in `source`, in page order.
+
+    `source` is the page source as str or UTF-8 bytes. Offsets are byte
+    offsets into its UTF-8 encoding. `default_language` is used for blocks
+    whose text does not identify the language.
+    """
+    # Decoding as Latin-1 maps every byte to one character, so the parser's
+    # positions are byte offsets; the ASCII markup and markers are unaffected.
+    parser = _NoticeIndexer(_as_bytes(source).decode("latin-1"), default_language)
+    parser.feed(parser.text)
+    return parser.result()
+
+
+def prune(source, cutoff, default_language=None):
+    """Remove notices dated before `cutoff` (a date or ISO string).
+
+    Notices without a date are kept. Returns a PruneResult with the pruned
+    source, the removed blocks and their HTML for archiving.
+    """
+    cutoff_iso = cutoff if isinstance(cutoff, str) else cutoff.isoformat()
+    data = _as_bytes(source)
+    blocks = index_notices(data, default_language)
+
+    kept = []
+    archived = []
+    removed = []
+    position = 0
+    for block in blocks:
+        if block.date_iso is None or block.date_iso >= cutoff_iso or block.start < position:
+            continue
+        # Take the whitespace in front of the block with it; the whitespace
+        # after it stays and separates what comes before and after
+        start = block.start
+        while start > position and data[start - 1] in _WHITESPACE:
+            start -= 1
+        kept.append(data[position:start])
+        archived.append(data[block.start:block.end] + b"\n")
+        removed.append(block)
+        position = block.end
+    kept.append(data[position:])
+
+    return PruneResult(
+        b"".join(kept).decode("utf-8"),
+        removed,
+        b"".join(archived).decode("utf-8"),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List or remove expired service interruption notices in a page source.")
+    parser.add_argument("source", help="saved page source")
+    parser.add_argument("--before", type=date.fromisoformat, help="remove notices dated before this day (YYYY-MM-DD)")
+    parser.add_argument("--language", choices=("en", "fr"), help="language of the page, for blocks that do not say")
+    parser.add_argument("-o", "--output", help="write the pruned source here")
+    parser.add_argument("--archive", help="append the removed notices to this file")
+    args = parser.parse_args(argv)
+
+    with open(args.source, "rb") as f:
+        data = f.read()
+
+    if args.before is None:
+        for block in index_notices(data, args.language):
+            print(f"{block.start:>10} {block.end:>10}  {block.kind:<5} {block.date_iso or '-':<10} {block.language or '-'}")
+        return 0
+
+    result = prune(data, args.before, args.language)
+    print(f"{len(result.removed)} notice(s) dated before {args.before.isoformat()} removed", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(result.source)
+    if args.archive and result.archived:
+        with open(args.archive, "a", encoding="utf-8") as f:
+            f.write(result.archived)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
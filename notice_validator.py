@@ -0,0 +1,261 @@
+"""Checks on the generated HTML snippets before they are pasted into Drupal.
+
+The snippets go straight into Canada.ca (WET) pages, so one unbalanced tag
+or stray attribute can break the page around them. validate_snippet() reads
+a snippet once with a small regex tokenizer, without building a DOM, and
+reports:
+
+- unbalanced tags: unclosed, misnested or unexpected end tags, and
+  paragraphs inside paragraphs
+- elements, attributes and classes that are not allowed in WET content
+- links to Drupal nodes: the data-entity-uuid links the snippet must carry,
+  and well-formed attributes on every such link
+- a heading <time> that differs from the notice date; a <time> in the
+  message body may give another date but must be a valid YYYY-MM-DD date
+- snippets larger than their byte budget
+
+The cost is linear in the snippet size, from tens of microseconds for a
+typical notice to about 0.6 ms at 12 KB (benchmarks/bench_validator.py), so
+the app runs it on every live preview update.
+
+Usage:
+    python notice_validator.py en_full.html --kind full --date 2025-01-31
+"""
+import argparse
+import os
+import re
+import sys
+from datetime import date
+from typing import NamedTuple
+
+from notice_render import CLIENT_SERVICE_CENTRE_UUID, CORRESPONDENCE_PROCEDURES_UUID, INTERRUPTIONS_PAGE_UUID
+from quill_sanitizer import ALLOWED_CLASSES, ALLOWED_TAGS, is_safe_url
+
+FULL_MESSAGE = "full"
+ALERT_BOX = "alert"
+KINDS = (FULL_MESSAGE, ALERT_BOX)
+
+# RenderedNotice field -> kind of snippet
+FIELD_KINDS = {
+    "english_html": FULL_MESSAGE,
+    "french_html": FULL_MESSAGE,
+    "english_alert_box_html": ALERT_BOX,
+    "french_alert_box_html": ALERT_BOX,
+}
+
+# Node links every snippet of a kind must contain (footer links, or the
+# Home page banner's link to the full message)
+REQUIRED_LINKS = {
+    FULL_MESSAGE: (CLIENT_SERVICE_CENTRE_UUID, CORRESPONDENCE_PROCEDURES_UUID),
+    ALERT_BOX: (INTERRUPTIONS_PAGE_UUID,),
+}
+
+# Element holding the <time> with the notice date: the full message's
+# heading, or the bold title of the Home page banner
+HEADING_ELEMENTS = {
+    FULL_MESSAGE: "h2",
+    ALERT_BOX: "strong",
+}
+
+# Maximum size of each kind of snippet in UTF-8 bytes
+BYTE_BUDGETS = {
+    FULL_MESSAGE: int(os.environ.get("NOTICE_FULL_MESSAGE_BUDGET", 16384)),
+    ALERT_BOX: int(os.environ.get("NOTICE_ALERT_BOX_BUDGET", 1024)),
+}
+
+# What the editor content may contain (see quill_sanitizer) plus the
+# templates' own wrapper markup
+ALLOWED_ELEMENTS = dict(ALLOWED_TAGS, h2=(), div=())
+ALLOWED_CLASS_NAMES = ALLOWED_CLASSES | {"alert", "alert-warning", "col-md-12", "mrgn-bttm-sm", "activeNotice"}
+
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+# The text before the next '<', then what that '<' starts: a start or end tag
+# (end mark, name, attribute text), a comment, a doctype, or nothing (a stray
+# '<'). Consecutive matches cover the markup up to its last '<'.
+_TOKEN = re.compile(
+    r"""([^<]*+)(<(?:(/?)([A-Za-z][A-Za-z0-9:-]*+)([^>"']*+(?:(?:"[^"]*+"|'[^']*+')[^>"']*+)*+)>|!--.*?-->|![^>]*+>)?)""", re.S
+)
+_ATTRIBUTE = re.compile(r"""([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?""")
+NO_ATTRIBUTES = {}
+_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z")
+
+
+class Problem(NamedTuple):
+    line: int
+    code: str
+    message: str
+
+    def __str__(self):
+        return f"line {self.line}: {self.message}"
+
+
+def _lines(markup, positions):
+    """Map each offset in `positions` to its 1-based line number, in one pass over `markup`."""
+    lines = {}
+    line, counted = 1, 0
+    for position in sorted(set(positions)):
+        line += markup.count("\n", counted, position)
+        counted = position
+        lines[position] = line
+    return lines
+
+
+def _is_iso_date(value):
+    try:
+        date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def validate_snippet(markup, kind, msg_date, budget=None):
+    """Return the problems found in one generated snippet.
+
+    `kind` is FULL_MESSAGE or ALERT_BOX, `msg_date` a date or ISO string and
+    `budget` the maximum size in bytes (default: BYTE_BUDGETS[kind]).
+    """
+    date_iso = msg_date if isinstance(msg_date, str) else msg_date.isoformat()
+    found = []  # (position, code, message)
+    report = found.append
+
+    stack = []  # (tag, position) of open elements
+    links = set()
+    times = 0
+    time_text = None  # text of the notice date <time> being read
+    # The notice date is the <time> in the heading; a <time> in the message
+    # body may give any other date (e.g. the end of the interruption)
+    heading = HEADING_ELEMENTS[kind]
+
+    position = 0
+    # findall returns plain tuples, much cheaper than match objects; offsets
+    # are added up from the lengths
+    for before, token, closing, tag, text in _TOKEN.findall(markup):
+        if before:
+            position += len(before)
+            if time_text is not None:
+                time_text.append(before)
+        start = position
+        position += len(token)
+        if not tag:
+            if token == "<":
+                report((start, "stray-lt", "'<' that does not start a tag; write it as &lt;"))
+            continue  # comment or doctype
+        tag = tag.lower()
+
+        if closing:
+            if stack and stack[-1][0] == tag and tag != "time":
+                stack.pop()
+                continue
+            if tag in VOID_ELEMENTS:
+                report((start, "void-end-tag", f"</{tag}> has no matching start tag; <{tag}> is never closed"))
+                continue
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][0] == tag:
+                    break
+            else:
+                report((start, "unexpected-end-tag", f"</{tag}> has no matching start tag"))
+                continue
+            for open_tag, open_position in stack[depth + 1:]:
+                report((open_position, "misnested", f"<{open_tag}> is closed by </{tag}> before its own end tag"))
+            del stack[depth:]
+            if tag == "time" and time_text is not None:
+                shown = "".join(time_text).strip()
+                if shown != date_iso:
+                    report((start, "time-text", f"<time> shows '{shown}' but the notice date is {date_iso}"))
+                time_text = None
+            continue
+
+        allowed = ALLOWED_ELEMENTS.get(tag)
+        if allowed is None:
+            report((start, "element-not-allowed", f"<{tag}> is not allowed in WET content"))
+        elif tag == "p" and any(open_tag == "p" for open_tag, _ in stack):
+            report((start, "nested-p", "<p> inside another <p>; browsers end the outer paragraph here"))
+
+        # Most tags in a notice have no attributes at all
+        if text:
+            values = {}
+            for name, double, single, bare in _ATTRIBUTE.findall(text):
+                name = name.lower()
+                value = values[name] = double or single or bare
+                if name == "class":
+                    for class_name in value.split():
+                        if class_name not in ALLOWED_CLASS_NAMES:
+                            report((start, "class-not-allowed", f"class '{class_name}' on <{tag}> is not allowed"))
+                elif allowed is not None and name not in allowed:
+                    report((start, "attribute-not-allowed", f"attribute '{name}' on <{tag}> is not allowed"))
+                elif name == "href" and not is_safe_url(value):
+                    report((start, "unsafe-url", f"link to '{value}' uses a scheme that is not allowed"))
+
+            if tag == "a" and "data-entity-uuid" in values:
+                uuid = values["data-entity-uuid"]
+                if not _UUID.match(uuid):
+                    report((start, "bad-uuid", f"data-entity-uuid '{uuid}' is not a UUID"))
+                if values.get("data-entity-type") != "node" or values.get("data-entity-substitution") != "canonical" or not values.get("href"):
+                    report((start, "bad-node-link", f"link to node {uuid} needs data-entity-type, data-entity-substitution and href"))
+                links.add(uuid)
+        else:
+            values = NO_ATTRIBUTES
+
+        if tag == "time":
+            datetime = values.get("datetime")
+            if any(open_tag == heading for open_tag, _ in stack):
+                times += 1
+                if datetime != date_iso:
+                    report((start, "time-datetime", f"<time datetime=\"{datetime}\"> differs from the notice date {date_iso}"))
+                time_text = []
+            elif not _is_iso_date(datetime):
+                report((start, "bad-datetime", f"<time datetime=\"{datetime}\"> is not a YYYY-MM-DD date"))
+
+        if tag not in VOID_ELEMENTS and not text.endswith("/"):
+            stack.append((tag, start))
+
+    for tag, position in stack:
+        report((position, "unclosed", f"<{tag}> is never closed"))
+    for uuid in REQUIRED_LINKS[kind]:
+        if uuid not in links:
+            report((len(markup), "missing-link", f"the link to node {uuid} is missing"))
+    if not times:
+        report((len(markup), "missing-time", "the <time> element with the notice date is missing"))
+
+    size = len(markup.encode("utf-8"))
+    budget = BYTE_BUDGETS[kind] if budget is None else budget
+    if size > budget:
+        report((len(markup), "over-budget", f"{size:,} bytes is over the budget of {budget:,} bytes"))
+
+    lines = _lines(markup, [position for position, _, _ in found])
+    return [Problem(lines[position], code, message) for position, code, message in found]
+
+
+def validate_notice(notice, msg_date, budgets=None):
+    """Return {RenderedNotice field: problems} for the snippets that have any."""
+    budgets = budgets or {}
+    results = {}
+    for field, kind in FIELD_KINDS.items():
+        problems = validate_snippet(getattr(notice, field), kind, msg_date, budgets.get(kind))
+        if problems:
+            results[field] = problems
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a generated service interruption snippet before it is pasted into Drupal.")
+    parser.add_argument("snippet", help="HTML file, or '-' for stdin")
+    parser.add_argument("--kind", choices=KINDS, required=True, help="full message or Home page alert box")
+    parser.add_argument("--date", type=date.fromisoformat, required=True, help="notice date (YYYY-MM-DD)")
+    parser.add_argument("--budget", type=int, help="maximum size in bytes (default: BYTE_BUDGETS for the kind)")
+    args = parser.parse_args(argv)
+
+    if args.snippet == "-":
+        markup = sys.stdin.read()
+    else:
+        with open(args.snippet, encoding="utf-8") as f:
+            markup = f.read()
+    problems = validate_snippet(markup, args.kind, args.date, args.budget)
+    for problem in problems:
+        print(f"{args.snippet}:{problem.line}: {problem.code}: {problem.message}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Insert generated notices into saved Drupal page sources.
+
+Steps 7 and 14 of the guide have the snippets pasted by hand next to a
+marker comment: above the "ENTER THE HTML CODE ..." comment on the Service
+and website interruptions page, and below the NOTICES comment on the Home
+page. splice() does the same on a saved page source. It finds the anchor
+with one regex scan, inserts the snippet and returns a unified diff of the
+change. The rest of the page is left untouched and never parsed.
+
+Usage:
+    python page_splicer.py home page-en.html snippet.html -o patched.html
+"""
+import argparse
+import re
+import sys
+from typing import NamedTuple
+
+INTERRUPTIONS_PAGE = "interruptions"
+HOME_PAGE = "home"
+PAGES = (INTERRUPTIONS_PAGE, HOME_PAGE)
+LANGUAGES = ("en", "fr")
+
+# Marker comments as they appear in the page sources (spacing and the number
+# of asterisks are not always consistent, so the patterns are lenient)
+INTERRUPTIONS_ANCHOR = re.compile(r"<!--\s*ENTER THE HTML CODE FOR NEW MESSAGE[^>]*?-->")
+HOME_ANCHOR = re.compile(r"<!--\s*\*+\s*NOTICES\s*\*+\s*-->")
+
+# page -> (anchor pattern, insert below the anchor line?)
+ANCHORS = {
+    INTERRUPTIONS_PAGE: (INTERRUPTIONS_ANCHOR, False),
+    HOME_PAGE: (HOME_ANCHOR, True),
+}
+
+# (page, language) -> RenderedNotice field holding the snippet for it
+SNIPPET_FIELDS = {
+    (INTERRUPTIONS_PAGE, "en"): "english_html",
+    (INTERRUPTIONS_PAGE, "fr"): "french_html",
+    (HOME_PAGE, "en"): "english_alert_box_html",
+    (HOME_PAGE, "fr"): "french_alert_box_html",
+}
+
+DIFF_CONTEXT = 3
+
+
+class AnchorNotFoundError(ValueError):
+    """The page source does not contain the expected marker comment."""
+
+
+class SpliceResult(NamedTuple):
+    source: str
+    diff: str
+    changed: bool
+
+
+def _line_start(text, pos):
+    return text.rfind("\n", 0, pos) + 1
+
+
+def _context_lines(text, at, count):
+    """Return up to `count` lines before and after line boundary `at`."""
+    start = at
+    for _ in range(count):
+        if start == 0:
+            break
+        start = text.rfind("\n", 0, start - 1) + 1
+    end = at
+    for _ in range(count):
+        if end >= len(text):
+            break
+        newline = text.find("\n", end)
+        end = len(text) if newline == -1 else newline + 1
+    return text[start:at].splitlines(), text[at:end].splitlines(), start
+
+
+def _unified_diff(source, at, inserted, name):
+    """Build the diff for a pure insertion at line boundary `at` without diffing the whole page."""
+    before, after, context_start = _context_lines(source, at, DIFF_CONTEXT)
+    first_line = source.count("\n", 0, context_start) + 1
+    added = inserted.splitlines()
+    old_len = len(before) + len(after)
+    new_len = old_len + len(added)
+    lines = [
+        f"--- a/{name}",
+        f"+++ b/{name}",
+        f"@@ -{first_line},{old_len} +{first_line},{new_len} @@",
+    ]
+    lines.extend(" " + line for line in before)
+    lines.extend("+" + line for line in added)
+    lines.extend(" " + line for line in after)
+    return "\n".join(lines) + "\n"
+
+
+def splice(source, snippet, page, name="page.html"):
+    """Insert `snippet` into `source` at the anchor comment for `page`.
+
+    Returns a SpliceResult with the patched source and a unified diff. If the
+    snippet is already on the page the source is returned unchanged, so
+    running the same patch twice is harmless.
+    """
+    pattern, below = ANCHORS[page]
+    match = pattern.search(source)
+    if match is None:
+        raise AnchorNotFoundError(f"{name}: marker comment for the {page} page not found")
+
+    block = snippet.strip("\n")
+    if block and block in source:
+        return SpliceResult(source, "", False)
+    inserted = block + "\n"
+
+    if below:
+        newline = source.find("\n", match.end())
+        if newline == -1:
+            source += "\n"
+            at = len(source)
+        else:
+            at = newline + 1
+    else:
+        at = _line_start(source, match.start())
+
+    patched = source[:at] + inserted + source[at:]
+    return SpliceResult(patched, _unified_diff(source, at, inserted, name), True)
+
+
+def splice_pages(sources, notice):
+    """Patch several page sources with one notice.
+
+    `sources` maps (page, language) to a page source, for any of the four
+    combinations; `notice` is a notice_render.RenderedNotice. Returns a dict
+    with a SpliceResult for each key in `sources`.
+    """
+    results = {}
+    for (page, language), source in sources.items():
+        snippet = getattr(notice, SNIPPET_FIELDS[(page, language)])
+        results[(page, language)] = splice(source, snippet, page, name=f"{page}-{language}.html")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Insert a generated notice into a saved Drupal page source.")
+    parser.add_argument("page", choices=PAGES, help="which page the source belongs to")
+    parser.add_argument("source", help="saved page source")
+    parser.add_argument("snippet", help="generated HTML snippet for that page and language")
+    parser.add_argument("-o", "--output", help="write the patched source here (default: print the diff only)")
+    args = parser.parse_args(argv)
+
+    with open(args.source, encoding="utf-8") as f:
+        source = f.read()
+    with open(args.snippet, encoding="utf-8") as f:
+        snippet = f.read()
+
+    try:
+        result = splice(source, snippet, args.page, name=args.source)
+    except AnchorNotFoundError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if not result.changed:
+        print("Notice is already on the page; nothing to do.", file=sys.stderr)
+    sys.stdout.write(result.diff)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(result.source)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
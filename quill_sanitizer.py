@@ -0,0 +1,262 @@
+"""Single-pass cleanup of the HTML produced by the Quill editors.
+
+Content pasted from Word or Outlook arrives full of Quill/Office classes,
+inline styles, spans and empty paragraphs. sanitize() keeps only markup that
+is valid on Canada.ca (WET) content pages and drops the rest. It runs in one
+pass over the input with html.parser, so the cost is linear in its size.
+"""
+import html
+import re
+from collections import Counter
+from html.parser import HTMLParser
+
+# Allowed tags and, for each, the attributes that may be kept
+ALLOWED_TAGS = {
+    "p": (),
+    "br": (),
+    "strong": (),
+    "em": (),
+    "u": (),
+    "s": (),
+    "sub": (),
+    "sup": (),
+    "code": (),
+    "blockquote": (),
+    "h3": (),
+    "h4": (),
+    "h5": (),
+    "ul": (),
+    "ol": (),
+    "li": (),
+    "a": ("href", "title", "data-entity-substitution", "data-entity-type", "data-entity-uuid"),
+    "abbr": ("title",),
+    "time": ("datetime",),
+    "span": (),
+}
+
+# Presentational tags that are mapped to their semantic equivalent
+RENAMED_TAGS = {"b": "strong", "i": "em", "strike": "s", "h1": "h3", "h2": "h3"}
+
+# Tags dropped together with everything inside them
+DROPPED_TAGS = {"script", "style", "head", "title", "meta", "link", "xml", "template", "iframe", "object"}
+
+VOID_TAGS = {"br"}
+
+# Blocks that are removed when they hold no text (e.g. Quill's <p><br></p>)
+BLOCK_TAGS = {"p", "h3", "h4", "h5", "li", "ul", "ol", "blockquote"}
+
+# Inline tags that are unwrapped when none of their attributes survive
+UNWRAP_WHEN_BARE = {"span", "a"}
+
+# WET utility classes that may survive; every other class (ql-*, Mso*, ...) is stripped
+ALLOWED_CLASSES = {"nowrap", "text-danger", "text-success", "text-warning", "text-info", "mrgn-bttm-0"}
+
+ALLOWED_URL_SCHEMES = ("http:", "https:", "mailto:", "tel:")
+
+_WHITESPACE = re.compile(r"[ \t\r\n\f]+")
+
+
+def is_safe_url(url):
+    """True for relative links and links with one of ALLOWED_URL_SCHEMES."""
+    url = url.strip()
+    if url.startswith(("/", "#", "?")):
+        return True
+    return url.lower().startswith(ALLOWED_URL_SCHEMES)
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        # Open elements: [source tag, index of the start tag in self.out
+        # (None if unwrapped), has_text, emitted tag]
+        self.stack = []
+        # Open elements per source tag, so stray end tags are ignored without
+        # scanning the stack (pasted content can hold thousands of them)
+        self.open_counts = Counter()
+        self.open_paragraphs = 0
+        self.drop_tag = None
+        self.drop_depth = 0
+        self.pending_space = False
+        self.at_block_boundary = True
+
+    def _emit_block_boundary(self, markup):
+        self.out.append(markup)
+        self.pending_space = False
+        self.at_block_boundary = True
+
+    def _emit_inline(self, markup):
+        if self.pending_space:
+            self.out.append(" ")
+            self.pending_space = False
+        self.out.append(markup)
+        self.at_block_boundary = False
+
+    def _open(self, frame):
+        self.stack.append(frame)
+        self.open_counts[frame[0]] += 1
+
+    def _separate(self):
+        """Keep a space between the text on either side of a dropped tag."""
+        self.pending_space = self.pending_space or not self.at_block_boundary
+
+    def _close(self, frame):
+        source_tag, start, has_text, tag = frame
+        self.open_counts[source_tag] -= 1
+        if has_text and self.stack:
+            self.stack[-1][2] = True
+        if start is None:
+            if tag == "p":
+                # A nested Outlook div: its text is a separate line of the paragraph
+                self._separate()
+            return
+        if tag == "p":
+            self.open_paragraphs -= 1
+        if (tag in BLOCK_TAGS and not has_text) or start == len(self.out) - 1:
+            # Empty element, e.g. Quill's <p><br></p>: discard it entirely
+            del self.out[start:]
+            return
+        if tag in BLOCK_TAGS:
+            # One top-level block per line keeps the Drupal source view readable
+            self._emit_block_boundary(f"</{tag}>" if self.stack else f"</{tag}>\n")
+        else:
+            self.out.append(f"</{tag}>")
+
+    def handle_starttag(self, tag, attrs):
+        if self.drop_depth:
+            if tag == self.drop_tag:
+                self.drop_depth += 1
+            return
+        if tag in DROPPED_TAGS:
+            self.drop_tag = tag
+            self.drop_depth = 1
+            return
+        source_tag = tag
+        tag = RENAMED_TAGS.get(tag, tag)
+        if tag == "div":
+            # Outlook uses divs as paragraphs; nested ones are unwrapped
+            tag = "p"
+            if self.open_paragraphs:
+                self._separate()
+                self._open([source_tag, None, False, tag])
+                return
+        elif tag == "p" and self.open_paragraphs:
+            # Paragraphs cannot nest: like a browser, a new one closes the open one
+            while self.open_paragraphs:
+                self._close(self.stack.pop())
+        allowed = ALLOWED_TAGS.get(tag)
+        if allowed is None:
+            # Unknown wrapper (font, o:p, ...): drop the tag, keep its text
+            self._separate()
+            return
+
+        kept = []
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name == "class":
+                classes = [c for c in value.split() if c in ALLOWED_CLASSES]
+                if classes:
+                    kept.append(("class", " ".join(classes)))
+            elif name in allowed:
+                if name == "href" and not is_safe_url(value):
+                    continue
+                kept.append((name, value))
+
+        if tag in UNWRAP_WHEN_BARE and not kept:
+            # Unwrapped, but tracked so the end tag still matches up
+            self._open([source_tag, None, False, tag])
+            return
+
+        markup = "<" + tag + "".join(f' {name}="{html.escape(value, quote=True)}"' for name, value in kept) + ">"
+        if tag in VOID_TAGS:
+            self.out.append(markup)
+            self.pending_space = False
+            return
+        if tag in BLOCK_TAGS:
+            self._emit_block_boundary(markup)
+        else:
+            self._emit_inline(markup)
+        if tag == "p":
+            self.open_paragraphs += 1
+        self._open([source_tag, len(self.out) - 1, False, tag])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if RENAMED_TAGS.get(tag, tag) not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.drop_depth:
+            if tag == self.drop_tag:
+                self.drop_depth -= 1
+            return
+        if tag not in ALLOWED_TAGS and tag not in RENAMED_TAGS and tag != "div":
+            self._separate()
+            return
+        if tag in VOID_TAGS or not self.open_counts[tag]:
+            # Stray end tag
+            return
+        # Close everything up to the matching open tag
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > depth:
+            self._close(self.stack.pop())
+
+    def handle_data(self, data):
+        if self.drop_depth:
+            return
+        # Quill's cursor placeholder and other zero-width characters
+        text = _WHITESPACE.sub(" ", data.replace("\ufeff", "").replace("\u200b", ""))
+        if self.at_block_boundary:
+            text = text.lstrip(" ")
+        if not text:
+            return
+        if text == " ":
+            self.pending_space = True
+            return
+        if self.pending_space and not text.startswith(" "):
+            text = " " + text
+        self.pending_space = text.endswith(" ")
+        if self.pending_space:
+            text = text[:-1]
+        if text.strip(" \xa0") and self.stack:
+            self.stack[-1][2] = True
+        self.out.append(html.escape(text, quote=False).replace("\xa0", "&nbsp;"))
+        self.at_block_boundary = False
+
+    def handle_comment(self, data):
+        # Office conditional comments and editor notes are never wanted
+        pass
+
+    def handle_decl(self, decl):
+        pass
+
+    def handle_pi(self, data):
+        pass
+
+    def unknown_decl(self, data):
+        pass
+
+    def result(self):
+        self.close()
+        while self.stack:
+            self._close(self.stack.pop())
+        return "".join(self.out).rstrip("\n")
+
+
+def sanitize(content):
+    """Return cleaned HTML for `content` from the editor.
+
+    Only WET-compatible tags and attributes are kept, Quill/Office classes and
+    inline styles are removed, and empty blocks such as <p><br></p> are dropped.
+    Unclosed tags are closed and stray end tags are ignored.
+    """
+    if not content:
+        return ""
+    parser = _Sanitizer()
+    parser.feed(content)
+    return parser.result()
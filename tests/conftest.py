@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The app's modules live at the top of the repository, not in a package
+sys.path.insert(0, ROOT)
+
+# Notices generated by the app tests go to a throwaway archive, never the real
+# one. Set before any test imports notice_archive, which reads it at import.
+_scratch = tempfile.mkdtemp(prefix="guide-tests-")
+os.environ.setdefault("NOTICE_ARCHIVE_PATH", os.path.join(_scratch, "archive.sqlite3"))
+os.environ.setdefault("TRANSLATION_MEMORY_PATH", os.path.join(_scratch, "memory.pickle"))
@@ -0,0 +1,116 @@
+import os
+import sqlite3
+
+import pytest
+from streamlit.elements.lib import policies
+from streamlit.testing.v1 import AppTest
+
+import notice_archive
+from conftest import ROOT
+from guide_steps import GUIDE_STEPS
+
+APP = os.path.join(ROOT, "Service_Interruption_Guide.py")
+TOOL_STEP = next(index for index, step in enumerate(GUIDE_STEPS) if step.tool)
+
+
+@pytest.fixture
+def app():
+    """The app on the wizard step with the message editor, with every field filled."""
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.session_state["wizard_step"] = TOOL_STEP
+    at.run()
+    at.text_input(key="en_title_single").input("Online services unavailable")
+    at.text_input(key="fr_title_single").input("Services en ligne indisponibles").run()
+    at.session_state["english_content_single"] = "<p>Our online services are unavailable.</p>"
+    at.session_state["french_content_single"] = "<p>Nos services en ligne sont indisponibles.</p>"
+    at.run()
+    assert not at.exception
+    return at
+
+
+def _button(at, label):
+    return next(button for button in at.button if button.label == label)
+
+
+def _html_outputs(at):
+    """The generated snippets, without the French suggestions shown as code too."""
+    return [code.value for code in at.code if code.language == "html"]
+
+
+def test_generated_output_survives_reruns_of_the_output_fragment(app):
+    _button(app, "Generate HTML Output").click().run()
+    assert [radio.key for radio in app.radio] == ["splice_page", "splice_language"]
+    assert len(_html_outputs(app)) == 4
+
+    # Choosing the page to splice reruns the fragment without the button click
+    app.radio(key="splice_page").set_value("home").run()
+
+    assert not app.exception
+    assert [radio.key for radio in app.radio] == ["splice_page", "splice_language"]
+    assert app.radio(key="splice_page").value == "home"
+    assert len(_html_outputs(app)) == 4
+
+
+def test_message_date_has_no_conflicting_default(monkeypatch):
+    # Streamlit shows this warning once per process; let it show again here
+    monkeypatch.setattr(policies, "_shown_default_value_warning", False)
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.session_state["wizard_step"] = TOOL_STEP
+    warnings = []
+    for step in (at.run, lambda: at.text_input(key="en_title_single").input("Outage").run(), at.run):
+        step()
+        warnings += [warning.value for warning in at.warning if "msg_date_single" in warning.value]
+
+    assert not warnings
+
+
+def test_clear_all_inputs_stays_on_the_current_step(app):
+    _button(app, "Clear All Inputs").click().run()
+
+    assert not app.exception
+    assert app.session_state["wizard_step"] == TOOL_STEP
+    assert app.text_input(key="en_title_single").value == ""
+    assert app.session_state["english_content_single"] == ""
+
+
+def test_loading_a_removed_past_notice_warns(app):
+    _button(app, "Generate HTML Output").click().run()
+    load = next(button for button in app.button if button.key.startswith("archive_load_"))
+    notice_id = int(load.key.rsplit("_", 1)[1])
+    with sqlite3.connect(notice_archive.DEFAULT_PATH) as connection:
+        connection.execute("DELETE FROM notices WHERE id = ?", (notice_id,))
+
+    load.click().run()
+
+    assert not app.exception
+    assert any("no longer in the archive" in warning.value for warning in app.warning)
+    assert app.text_input(key="en_title_single").value == "Online services unavailable"
+
+
+def test_saving_to_a_locked_archive_reports_an_error(app):
+    app.text_input(key="en_title_single").input("Locked archive").run()
+    connection = sqlite3.connect(notice_archive.DEFAULT_PATH, isolation_level=None)
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        _button(app, "Generate HTML Output").click().run()
+    finally:
+        connection.rollback()
+        connection.close()
+
+    assert not app.exception
+    assert any("could not be saved" in error.value for error in app.error)
+    assert len(_html_outputs(app)) == 4
+
+
+def test_generated_output_is_hidden_once_the_inputs_change(app):
+    _button(app, "Generate HTML Output").click().run()
+    assert any("Online services unavailable" in html for html in _html_outputs(app))
+
+    app.text_input(key="en_title_single").input("Outage").run()
+
+    assert not app.exception
+    assert _html_outputs(app) == []
+    assert any("Generate HTML Output' again" in info.value for info in app.info)
+
+    _button(app, "Generate HTML Output").click().run()
+    assert any("Outage" in html for html in _html_outputs(app))
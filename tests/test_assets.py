@@ -0,0 +1,24 @@
+from streamlit.testing.v1 import AppTest
+
+from assets import PREFETCH_KEY_PREFIX, PREFETCH_STYLE
+
+
+def _prefetch_then_show():
+    from assets import prefetch_step_image, show_step_image
+
+    prefetch_step_image("7.1")
+    show_step_image("7.1")
+
+
+def test_prefetched_image_is_hidden_and_has_the_url_shown_later():
+    at = AppTest.from_function(_prefetch_then_show).run()
+    assert not at.exception
+
+    hidden, shown = at.main.children.values()
+    assert hidden.proto.id.endswith(f"-{PREFETCH_KEY_PREFIX}7.1")
+    assert [html.proto.body for html in at.get("html")] == [PREFETCH_STYLE]
+    prefetched = hidden.get("imgs")[0].proto.imgs[0]
+    displayed = shown.proto.imgs[0]
+    assert prefetched.caption == ""
+    assert displayed.caption == "Step 7.1: Click 'Source' to preview"
+    assert prefetched.url == displayed.url
@@ -0,0 +1,46 @@
+import io
+import json
+
+from batch_notices import RowError, generate, read_rows
+
+VALID = {"en_title": "Outage", "fr_title": "Panne", "date": "2025-01-31", "en_body": "<p>Down</p>", "fr_body": "<p>En panne</p>"}
+
+
+def _results(lines):
+    return list(generate(read_rows(io.StringIO("\n".join(lines) + "\n"), "jsonl")))
+
+
+def test_malformed_json_row_is_reported_and_skipped():
+    results = _results([json.dumps(VALID), '{"en_title": "Outage",', json.dumps(VALID)])
+
+    assert [row_number for row_number, _ in results] == [1, 2, 3]
+    assert isinstance(results[1][1], RowError)
+    assert "invalid JSON" in str(results[1][1])
+    assert not isinstance(results[0][1], RowError)
+    assert not isinstance(results[2][1], RowError)
+
+
+def test_non_string_date_is_a_row_error():
+    results = _results([json.dumps(dict(VALID, date=20250131)), json.dumps(VALID)])
+
+    assert isinstance(results[0][1], RowError)
+    assert "date must be a string" in str(results[0][1])
+    assert not isinstance(results[1][1], RowError)
+
+
+def test_non_object_row_is_a_row_error():
+    results = _results(["[1, 2]", json.dumps(VALID)])
+
+    assert isinstance(results[0][1], RowError)
+    assert not isinstance(results[1][1], RowError)
+
+
+def test_bad_rows_are_reported_from_worker_processes():
+    lines = ["not json", json.dumps(dict(VALID, en_title=7)), json.dumps(VALID)]
+    text = "\n".join(lines) + "\n"
+
+    serial = list(generate(read_rows(io.StringIO(text), "jsonl")))
+    pooled = list(generate(read_rows(io.StringIO(text), "jsonl"), workers=2))
+
+    assert [str(result) for _, result in pooled[:2]] == [str(result) for _, result in serial[:2]]
+    assert pooled[2] == serial[2]
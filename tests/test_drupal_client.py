@@ -0,0 +1,110 @@
+import pytest
+
+from drupal_client import BODY_FIELD, CONFLICT_MESSAGE, DRAFT, PUBLISHED, STATE_FIELD, DrupalClient, DrupalError
+from mock_drupal import MockDrupal
+from notice_render import render_notice
+from page_splicer import HOME_PAGE, INTERRUPTIONS_PAGE, SNIPPET_FIELDS
+
+NOTICE = render_notice(
+    "Online services unavailable", "Services en ligne indisponibles", "2025-06-06",
+    "<p>Our online services will be unavailable.</p>", "<p>Nos services en ligne seront indisponibles.</p>",
+)
+
+
+@pytest.fixture
+def server():
+    with MockDrupal() as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    with DrupalClient(server.url, backoff=0.01) as client:
+        yield client
+
+
+def _nid(server, page):
+    return server.interruptions_nid if page == INTERRUPTIONS_PAGE else server.home_nid
+
+
+def _other_user_edit(server, nid, language):
+    """Form fields of a save made by someone else, from an up-to-date form."""
+    return {
+        "form_token": server.token,
+        "changed": str(server.changed[nid]),
+        BODY_FIELD: server.nodes[nid][language]["body"],
+        STATE_FIELD: DRAFT,
+    }
+
+
+def test_publish_saves_a_draft_of_every_page_and_language(server, client):
+    updates = client.publish_notice(NOTICE, server.home_nid, interruptions_nid=server.interruptions_nid)
+
+    assert sorted((update.page, update.language) for update in updates) == sorted(SNIPPET_FIELDS)
+    assert all(update.changed for update in updates)
+    for (page, language), field in SNIPPET_FIELDS.items():
+        node = server.nodes[_nid(server, page)][language]
+        assert getattr(NOTICE, field).strip("\n") in node["body"]
+        assert node["state"] == DRAFT
+        assert node["saves"] == 1
+    # One form load and one save per translation: no conflicts between the
+    # translations of a node, so no retries
+    assert server.requests == 8
+
+
+def test_publishing_again_changes_nothing(server, client):
+    client.publish_notice(NOTICE, server.home_nid, interruptions_nid=server.interruptions_nid)
+    updates = client.publish_notice(NOTICE, server.home_nid, interruptions_nid=server.interruptions_nid)
+
+    assert not any(update.changed for update in updates)
+    assert all(node["saves"] == 1 for translations in server.nodes.values() for node in translations.values())
+
+
+def test_publishing_a_draft_changes_only_the_state(server, client):
+    client.publish_notice(NOTICE, server.home_nid, interruptions_nid=server.interruptions_nid, pages=[HOME_PAGE])
+    updates = client.publish_notice(
+        NOTICE, server.home_nid, state=PUBLISHED, interruptions_nid=server.interruptions_nid, pages=[HOME_PAGE]
+    )
+
+    assert [update.changed for update in updates] == [True, True]
+    assert [node["state"] for node in server.nodes[server.home_nid].values()] == [PUBLISHED, PUBLISHED]
+    assert server.nodes[server.home_nid]["en"]["body"].count("activeNotice") == 1
+
+
+def test_server_errors_are_retried(server, client):
+    server.fail_next = 3
+
+    update = client.update_page(HOME_PAGE, "en", server.home_nid, NOTICE.english_alert_box_html)
+
+    assert update.changed
+    assert server.requests == 5  # three failures, then the form load and the save
+    assert server.nodes[server.home_nid]["en"]["saves"] == 1
+
+
+def test_a_stale_form_is_rejected_and_the_update_retried(server, client):
+    nid = server.interruptions_nid
+    form = client.get_form(nid, "fr")
+    # Someone saves the other translation in the meantime
+    assert server.save(nid, "en", _other_user_edit(server, nid, "en")) is None
+
+    with pytest.raises(DrupalError, match=CONFLICT_MESSAGE) as error:
+        client.save(form, form.body, DRAFT)
+    assert error.value.transient
+
+    loads = []
+    get_form = client.get_form
+
+    def get_form_then_edit_elsewhere(*args):
+        form = get_form(*args)
+        if not loads:
+            server.changed[nid] += 1  # another save between this load and ours
+        loads.append(form)
+        return form
+
+    client.get_form = get_form_then_edit_elsewhere
+    update = client.update_page(INTERRUPTIONS_PAGE, "fr", nid, NOTICE.french_html)
+
+    assert update.changed
+    assert len(loads) == 2
+    assert NOTICE.french_html.strip("\n") in server.nodes[nid]["fr"]["body"]
+
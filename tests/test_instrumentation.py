@@ -0,0 +1,34 @@
+import os
+import threading
+
+import instrumentation
+
+
+def test_concurrent_metrics_writes_do_not_collide(tmp_path):
+    path = str(tmp_path / "guide.prom")
+    errors = []
+
+    def write():
+        for _ in range(100):
+            try:
+                instrumentation.write_metrics(path)
+            except OSError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(tmp_path) == ["guide.prom"]
+
+
+def test_end_rerun_survives_an_unwritable_metrics_file(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(instrumentation, "ENABLED", True)
+    monkeypatch.setattr(instrumentation, "METRICS_FILE", str(tmp_path / "missing" / "guide.prom"))
+
+    instrumentation.end_rerun()
+
+    assert "could not write" in capsys.readouterr().err
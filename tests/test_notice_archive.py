@@ -0,0 +1,57 @@
+from notice_archive import NoticeArchive
+from notice_render import render_notice
+
+
+def _add(archive, en_title, fr_title, date_iso, en_body="<p>Body.</p>", fr_body="<p>Texte.</p>"):
+    notice = render_notice(en_title, fr_title, date_iso, en_body, fr_body)
+    return archive.add(en_title, fr_title, date_iso, en_body, fr_body, notice)
+
+
+def _titles(results):
+    return [result.en_title for result in results]
+
+
+def test_storing_the_same_notice_again_keeps_one_copy(tmp_path):
+    archive = NoticeArchive(str(tmp_path / "archive.sqlite3"))
+    first = _add(archive, "Maintenance", "Entretien", "2025-01-31")
+
+    assert _add(archive, "Maintenance", "Entretien", "2025-01-31") == first
+    assert _add(archive, "Maintenance", "Entretien", "2025-02-01") != first
+    assert len(archive) == 2
+    assert archive.get(first).date_iso == "2025-01-31"
+    assert archive.get(first + 100) is None
+
+
+def test_last_word_matches_as_a_prefix(tmp_path):
+    archive = NoticeArchive(str(tmp_path / "archive.sqlite3"))
+    _add(archive, "Planned maintenance", "Entretien planifié", "2025-01-31")
+    _add(archive, "Patent database outage", "Panne de la base de données des brevets", "2025-02-01")
+
+    assert _titles(archive.search("maint")) == ["Planned maintenance"]
+    assert _titles(archive.search("planned mai")) == ["Planned maintenance"]
+    # Earlier words must match whole
+    assert _titles(archive.search("plan maintenance")) == []
+    assert _titles(archive.search("brev")) == ["Patent database outage"]
+
+
+def test_search_ignores_accents_and_reads_the_message_text(tmp_path):
+    archive = NoticeArchive(str(tmp_path / "archive.sqlite3"))
+    _add(archive, "Network outage", "Panne du réseau", "2025-01-31", fr_body="<p>Le <strong>réseau</strong> est en panne.</p>")
+
+    assert _titles(archive.search("reseau")) == ["Network outage"]
+    assert _titles(archive.search("RÉSEAU")) == ["Network outage"]
+    assert _titles(archive.search("strong")) == []  # markup is not indexed
+
+
+def test_results_are_newest_first(tmp_path):
+    archive = NoticeArchive(str(tmp_path / "archive.sqlite3"))
+    _add(archive, "Outage one", "Panne un", "2025-03-01")
+    _add(archive, "Outage two", "Panne deux", "2025-01-01")
+    _add(archive, "Outage three", "Panne trois", "2025-02-01")
+
+    # Matches: most recently stored first
+    assert _titles(archive.search("outage")) == ["Outage three", "Outage two", "Outage one"]
+    assert _titles(archive.search("outage", limit=2)) == ["Outage three", "Outage two"]
+    # No query: latest notice dates first
+    assert _titles(archive.search("")) == ["Outage one", "Outage three", "Outage two"]
+    assert _titles(archive.search("  ?! ")) == ["Outage one", "Outage three", "Outage two"]
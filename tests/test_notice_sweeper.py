@@ -0,0 +1,89 @@
+import os
+import time
+from datetime import date, timedelta
+
+from notice_render import render_notice
+from notice_sweeper import FULL_MESSAGE, index_notices, prune
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_prune_keeps_the_content_after_the_last_message():
+    page = _fixture("interruptions_page_en.html")
+
+    result = prune(page, "2025-01-01")
+
+    assert [block.date_iso for block in result.removed] == ["2024-03-15"]
+    assert "Online services unavailable" not in result.source
+    assert "Patent filing delays" in result.source
+    # Everything the page has after the old message stays on the page
+    tail = page[page.index("<h3>Related links</h3>"):]
+    assert result.source.endswith(tail)
+    assert result.archived.count("<h2") == 1
+    assert "Related links" not in result.archived
+    assert result.archived.rstrip().endswith("Correspondence Procedures</a>.</p>")
+
+
+def test_prune_keeps_the_content_after_an_alert_box():
+    page = _fixture("home_page_en.html")
+
+    result = prune(page, "2025-01-01")
+
+    assert len(result.removed) == 1
+    assert "activeNotice" not in result.source
+    assert "Welcome to the Canadian Intellectual Property Office." in result.source
+
+
+def test_message_without_footer_ends_before_page_markup():
+    page = (
+        '<div><h2 class="text-danger">Old (<time datetime="2020-01-01">2020-01-01</time>)</h2>\n'
+        "<p>Written by hand, no footer.</p>\n"
+        '<div class="pagedetails">Date modified</div></div>'
+    )
+
+    [block] = index_notices(page)
+
+    assert page.encode("utf-8")[block.start:block.end].endswith(b"no footer.</p>")
+    assert 'class="pagedetails"' in prune(page, "2025-01-01").source
+
+
+def _archive_page(count):
+    first = date(2000, 1, 1)
+    parts = ['<div class="mwsgeneric-base-html">\n']
+    for i in range(count):
+        notice = render_notice(
+            f"Interruption {i}", f"Interruption {i}", first + timedelta(days=i),
+            f"<p>Message {i} about planned maintenance.</p>", "",
+        )
+        parts.append(notice.english_html)
+    parts.append("<p>Page footer</p>\n</div>\n")
+    return "".join(parts)
+
+
+def _prune_seconds(page, cutoff):
+    start = time.perf_counter()
+    result = prune(page, cutoff)
+    return time.perf_counter() - start, result
+
+
+def test_prune_scales_linearly_to_thousands_of_notices():
+    small, large = _archive_page(500), _archive_page(5000)
+    cutoff = (date(2000, 1, 1) + timedelta(days=2500)).isoformat()
+
+    assert len(index_notices(large)) == 5000
+    assert {block.kind for block in index_notices(large)} == {FULL_MESSAGE}
+
+    small_seconds, _ = _prune_seconds(small, cutoff)
+    large_seconds, result = _prune_seconds(large, cutoff)
+
+    assert len(result.removed) == 2500
+    assert result.source.count('class="text-danger"') == 2500
+    assert result.source.rstrip().endswith("<p>Page footer</p>\n</div>")
+    # Ten times the notices should take about ten times as long, not a hundred
+    assert large_seconds < 30 * small_seconds + 0.05, f"500: {small_seconds:.3f}s, 5000: {large_seconds:.3f}s"
+    assert large_seconds < 5
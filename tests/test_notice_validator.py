@@ -0,0 +1,62 @@
+import time
+
+from notice_render import render_notice
+from notice_validator import ALERT_BOX, FULL_MESSAGE, validate_notice, validate_snippet
+
+DATE = "2025-01-31"
+
+
+def _codes(markup, kind=FULL_MESSAGE):
+    return [problem.code for problem in validate_snippet(markup, kind, DATE)]
+
+
+def _full_message(body):
+    return render_notice("Outage", "Panne", DATE, body, "<p>Texte.</p>").english_html
+
+
+def test_generated_notice_has_no_problems():
+    notice = render_notice("Outage", "Panne", DATE, "<p>Our services are unavailable.</p>", "<p>Nos services sont indisponibles.</p>")
+    assert validate_notice(notice, DATE) == {}
+
+
+def test_nested_paragraphs_are_reported():
+    assert _codes(_full_message("<p>outer <p>inner</p> outer</p>")) == ["nested-p"]
+    assert _codes(_full_message("<p>one</p><p>two</p>")) == []
+
+
+def test_unsafe_links_are_reported():
+    assert "unsafe-url" in _codes(_full_message('<p><a href="javascript:alert(1)">x</a></p>'))
+    assert "unsafe-url" not in _codes(_full_message('<p><a href="https://www.canada.ca/">x</a></p>'))
+    assert "missing-link" in _codes("<p>no links</p>", ALERT_BOX)
+
+
+def test_body_dates_are_not_compared_with_the_notice_date():
+    body = (
+        'Unavailable from <time datetime="2025-06-06">Friday, June 6, 2025</time>'
+        ' until <time datetime="2025-06-09">Monday</time>'
+    )
+    assert _codes(_full_message(f"<p>{body}</p>")) == []
+    assert _codes(_full_message('<p>Back on <time datetime="June 9">Monday</time></p>')) == ["bad-datetime"]
+
+
+def test_the_heading_date_must_match_the_notice_date():
+    markup = _full_message("<p>Text.</p>")
+    assert _codes(markup.replace(f">{DATE}</time>", ">2025-02-01</time>")) == ["time-text"]
+    assert _codes(markup.replace(f'datetime="{DATE}"', 'datetime="2025-02-01"')) == ["time-datetime"]
+    alert = render_notice("Outage", "Panne", DATE, "<p>Text.</p>", "<p>Texte.</p>").english_alert_box_html
+    assert _codes(alert.replace(f'datetime="{DATE}"', 'datetime="2025-02-01"'), ALERT_BOX) == ["time-datetime"]
+
+
+def test_problems_are_reported_on_their_line():
+    problems = validate_snippet("<p>one</p>\n<p>two <</p>\n\n</em>", FULL_MESSAGE, DATE)
+    lines = {problem.code: problem.line for problem in problems}
+    assert lines["stray-lt"] == 2
+    assert lines["unexpected-end-tag"] == 4
+    assert lines["missing-time"] == 4
+
+
+def test_many_problems_take_linear_time():
+    start = time.perf_counter()
+    problems = validate_snippet("</em>\n" * 20000, FULL_MESSAGE, DATE)
+    assert [problem.line for problem in problems if problem.code == "unexpected-end-tag"] == list(range(1, 20001))
+    assert time.perf_counter() - start < 0.5
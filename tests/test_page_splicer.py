@@ -0,0 +1,103 @@
+import os
+import re
+
+import pytest
+
+from notice_render import render_notice
+from page_splicer import HOME_PAGE, INTERRUPTIONS_PAGE, SNIPPET_FIELDS, AnchorNotFoundError, splice, splice_pages
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+NOTICE = render_notice(
+    "Online services unavailable", "Services en ligne indisponibles", "2025-06-06",
+    "<p>Our online services will be unavailable.</p>", "<p>Nos services en ligne seront indisponibles.</p>",
+)
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _apply(source, diff):
+    """Apply a one-hunk unified diff, checking its header against the source."""
+    header = re.match(r"@@ -(\d+),(\d+) \+(\d+),(\d+) @@\Z", diff.splitlines()[2])
+    old_start, old_len, new_start, new_len = map(int, header.groups())
+    body = diff.splitlines()[3:]
+    old = [line[1:] for line in body if line[0] in " -"]
+    new = [line[1:] for line in body if line[0] in " +"]
+    assert (len(old), len(new), new_start) == (old_len, new_len, old_start)
+    lines = source.splitlines()
+    assert lines[old_start - 1:old_start - 1 + old_len] == old
+    lines[old_start - 1:old_start - 1 + old_len] = new
+    return "\n".join(lines) + "\n"
+
+
+def test_full_message_goes_on_the_line_above_the_interruptions_marker():
+    source = _fixture("interruptions_page_en.html")
+    result = splice(source, NOTICE.english_html, INTERRUPTIONS_PAGE)
+
+    assert result.changed
+    marker = result.source.index("<!-- ENTER THE HTML CODE")
+    assert result.source[:marker].endswith(NOTICE.english_html.strip("\n") + "\n")
+    assert result.source.replace(NOTICE.english_html.strip("\n") + "\n", "", 1) == source
+
+
+def test_alert_box_goes_on_the_line_below_the_notices_marker():
+    source = _fixture("home_page_en.html")
+    result = splice(source, NOTICE.english_alert_box_html, HOME_PAGE)
+
+    marker = "<!-- *****************NOTICES****** -->\n"
+    assert marker + NOTICE.english_alert_box_html.strip("\n") + "\n" in result.source
+    assert result.source.replace(NOTICE.english_alert_box_html.strip("\n") + "\n", "", 1) == source
+
+
+@pytest.mark.parametrize("page, fixture", [
+    (INTERRUPTIONS_PAGE, "interruptions_page_en.html"),
+    (HOME_PAGE, "home_page_en.html"),
+])
+def test_diff_applies_to_the_source(page, fixture):
+    source = _fixture(fixture)
+    snippet = getattr(NOTICE, SNIPPET_FIELDS[(page, "en")])
+    result = splice(source, snippet, page, name=fixture)
+
+    assert result.diff.startswith(f"--- a/{fixture}\n+++ b/{fixture}\n")
+    assert _apply(source, result.diff) == result.source
+
+
+def test_diff_hunk_header_counts_the_inserted_lines():
+    source = "".join(f"line {number}\n" for number in range(1, 11)) + "<!-- ENTER THE HTML CODE FOR NEW MESSAGE BELOW THIS LINE -->\n"
+    result = splice(source, "<h2>new</h2>\n<p>text</p>\n", INTERRUPTIONS_PAGE, name="page.html")
+
+    assert result.diff.splitlines()[:3] == ["--- a/page.html", "+++ b/page.html", "@@ -8,4 +8,6 @@"]
+    assert result.diff.splitlines()[6:8] == ["+<h2>new</h2>", "+<p>text</p>"]
+
+
+def test_splicing_the_same_notice_again_changes_nothing():
+    first = splice(_fixture("interruptions_page_en.html"), NOTICE.english_html, INTERRUPTIONS_PAGE)
+    again = splice(first.source, NOTICE.english_html, INTERRUPTIONS_PAGE)
+
+    assert not again.changed
+    assert again.source == first.source
+    assert again.diff == ""
+
+
+def test_missing_marker_raises():
+    with pytest.raises(AnchorNotFoundError, match="home page"):
+        splice(_fixture("interruptions_page_en.html"), NOTICE.english_alert_box_html, HOME_PAGE, name="page.html")
+
+
+def test_splice_pages_patches_each_page_and_language():
+    sources = {
+        (INTERRUPTIONS_PAGE, "en"): _fixture("interruptions_page_en.html"),
+        (INTERRUPTIONS_PAGE, "fr"): _fixture("interruptions_page_en.html"),
+        (HOME_PAGE, "en"): _fixture("home_page_en.html"),
+        (HOME_PAGE, "fr"): _fixture("home_page_en.html"),
+    }
+    results = splice_pages(sources, NOTICE)
+
+    assert set(results) == set(SNIPPET_FIELDS)
+    for key, result in results.items():
+        snippet = getattr(NOTICE, SNIPPET_FIELDS[key]).strip("\n")
+        assert result.changed
+        assert snippet in result.source
+        assert result.diff.startswith(f"--- a/{key[0]}-{key[1]}.html\n")
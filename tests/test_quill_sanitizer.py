@@ -0,0 +1,25 @@
+import time
+
+from quill_sanitizer import sanitize
+
+
+def test_stray_end_tags_are_linear():
+    # Thousands of open inline tags followed by end tags that match none of them
+    content = "<p>" + "<em>" * 10000 + "x" + "</strong>" * 20000
+
+    start = time.perf_counter()
+    cleaned = sanitize(content)
+    elapsed = time.perf_counter() - start
+
+    assert "</strong>" not in cleaned
+    assert elapsed < 2, f"{elapsed:.1f}s for 20k stray end tags"
+
+
+def test_nested_divs_keep_text_apart():
+    assert sanitize("<div>one<div>two</div><div>three</div></div>") == "<p>one two three</p>"
+    assert sanitize("<div><div>two</div><div>three</div></div>") == "<p>two three</p>"
+
+
+def test_nested_paragraph_closes_the_open_one():
+    assert sanitize("<p>a<p>b</p>c</p>") == "<p>a</p>\n<p>b</p>\nc"
+    assert sanitize("<p><strong>a<p>b</strong></p>") == "<p><strong>a</strong></p>\n<p>b</p>"
@@ -0,0 +1,73 @@
+import os
+
+from notice_archive import NoticeArchive
+from notice_render import render_notice
+from translation_memory import SharedMemory, TranslationMemory
+
+EN_BODY = "<p>Our online services will be unavailable on Saturday.</p>"
+FR_BODY = "<p>Nos services en ligne seront indisponibles samedi.</p>"
+SENTENCE = "Our online services will be unavailable on Saturday."
+
+
+def _archive_notice(archive, en_body, fr_body):
+    notice = render_notice("Outage", "Panne", "2025-01-31", en_body, fr_body)
+    archive.add("Outage", "Panne", "2025-01-31", en_body, fr_body, notice)
+
+
+def test_added_notices_are_found_and_saved(tmp_path):
+    memory = TranslationMemory.build([("Our offices are closed.", "Nos bureaux sont fermés.")])
+    memory.add_notice("Outage", "Panne", EN_BODY, FR_BODY)
+
+    assert memory.lookup(SENTENCE).french == "Nos services en ligne seront indisponibles samedi."
+    assert memory.lookup("Our offices are closed.").french == "Nos bureaux sont fermés."
+
+    # A newer translation of the same segment replaces the older one
+    memory.add_notice("Outage", "Panne", EN_BODY, "<p>Nos services en ligne ne seront pas disponibles samedi.</p>")
+    assert memory.lookup(SENTENCE).french == "Nos services en ligne ne seront pas disponibles samedi."
+
+    path = str(tmp_path / "memory.pickle")
+    memory.save(path)
+    assert os.listdir(tmp_path) == ["memory.pickle"]
+    loaded = TranslationMemory.load(path)
+    assert len(loaded) == len(memory)
+    assert loaded.lookup(SENTENCE) == memory.lookup(SENTENCE)
+
+
+def test_shared_memory_adds_new_notices_without_rebuilding(tmp_path):
+    archive = NoticeArchive(str(tmp_path / "archive.sqlite3"))
+    path = str(tmp_path / "memory.pickle")
+
+    # No saved memory yet: built from the archive once, and saved
+    shared = SharedMemory(archive, path)
+    assert shared.wait(30)
+    memory = shared.memory
+    assert memory.notices == 0
+    assert memory.lookup(SENTENCE) is None
+    saved = os.path.getmtime(path)
+
+    _archive_notice(archive, EN_BODY, FR_BODY)
+    shared.refresh()
+    assert shared.wait(30)
+    assert shared.memory is memory
+    assert memory.notices == 1
+    assert memory.lookup(SENTENCE).french == "Nos services en ligne seront indisponibles samedi."
+    assert os.path.getmtime(path) == saved
+
+    # The next process loads the saved memory and catches up the same way
+    restarted = SharedMemory(archive, path)
+    assert restarted.wait(30)
+    assert restarted.memory.notices == 1
+    assert restarted.memory.lookup(SENTENCE) is not None
+    assert os.path.getmtime(path) == saved
+
+
+def test_shared_memory_rebuilds_a_memory_saved_by_an_older_version(tmp_path):
+    archive = NoticeArchive(str(tmp_path / "archive.sqlite3"))
+    _archive_notice(archive, EN_BODY, FR_BODY)
+    path = str(tmp_path / "memory.pickle")
+    TranslationMemory.build([]).save(path)
+
+    shared = SharedMemory(archive, path)
+    assert shared.wait(30)
+    assert shared.memory.notices == 1
+    assert shared.memory.lookup(SENTENCE) is not None
@@ -0,0 +1,421 @@
+"""Offline translation memory for the French fields.
+
+Past notices are split into aligned English/French segments (titles,
+paragraphs and sentences), and the fixed sentences of the templates are
+added. The result is indexed with MinHash over character trigrams.
+suggest() returns the French side of the most similar English segment, so
+authors can reuse wording that has already been published. Nothing is sent
+to a translation service.
+
+The index is precomputed and array-backed: each LSH band is a sorted
+array of bucket keys with a parallel array of segment ids. Candidates are
+found by binary search, then re-scored by exact trigram similarity.
+
+Notices archived after a build are added to a small dict-based index that
+lookups search alongside the arrays; `build` folds them into the arrays. In
+the app, SharedMemory loads the saved memory in a background thread and adds
+each newly archived notice to it.
+
+Usage:
+    python translation_memory.py build          # from the notice archive
+    python translation_memory.py query "Our online services will be unavailable."
+"""
+import argparse
+import os
+import pickle
+import re
+import sys
+import tempfile
+import threading
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from html import unescape
+from typing import NamedTuple
+
+from notice_render import ENGLISH_ALERT_PREFIX, ENGLISH_FOOTER, FRENCH_ALERT_PREFIX, FRENCH_FOOTER
+
+DEFAULT_PATH = os.environ.get(
+    "TRANSLATION_MEMORY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "translation_memory.pickle"),
+)
+
+NGRAM = 3
+BANDS = 16
+ROWS = 2  # hashes per band; BANDS * ROWS MinHash values per segment
+MAX_BUCKET = 256  # a band bucket larger than this only votes for its newest segments
+MAX_CANDIDATES = 20  # segments re-scored exactly per lookup
+MIN_SCORE = 0.3
+
+_MASK = (1 << 64) - 1
+_HASH_BITS = 30  # keeps MinHash values in single-digit Python ints, which min() compares fastest
+# Fixed per-hash XOR masks (not Python's salted hash()) so an index built in
+# one process works in another
+_SEEDS = [((0x9E3779B97F4A7C15 * (i + 1)) & _MASK) >> (64 - _HASH_BITS) for i in range(BANDS * ROWS)]
+
+_TAG = re.compile(r"<[^>]*>")
+_BLOCK_END = re.compile(r"</(?:p|li|h[1-6]|div|blockquote)>|<br\s*/?>", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-ZÀ-Ý«\"(])")
+_SPACE = re.compile(r"\s+")
+_NON_WORD = re.compile(r"[^\w ]+")
+
+
+class Suggestion(NamedTuple):
+    english: str  # the segment being translated
+    french: str  # suggested translation
+    score: float  # trigram similarity of the matched English segment, 0-1
+    matched: str  # English segment from the memory
+
+
+def normalize(text):
+    return _SPACE.sub(" ", _NON_WORD.sub(" ", text.lower())).strip()
+
+
+def trigrams(text):
+    padded = f" {normalize(text)} "
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+def _gram_hash(gram):
+    # Mix the CRC so the XOR masks act as independent hash functions
+    return ((zlib.crc32(gram.encode("utf-8")) * 0xFF51AFD7ED558CCD) & _MASK) >> (64 - _HASH_BITS)
+
+
+def _gram_hashes(grams, cache=None):
+    if cache is None:
+        return [_gram_hash(gram) for gram in grams]
+    hashes = []
+    for gram in grams:
+        value = cache.get(gram)
+        if value is None:
+            value = cache[gram] = _gram_hash(gram)
+        hashes.append(value)
+    return hashes
+
+
+def _minhash(hashes):
+    return [min(map(seed.__xor__, hashes)) for seed in _SEEDS]
+
+
+def _band_keys(signature):
+    for band in range(BANDS):
+        values = signature[band * ROWS:(band + 1) * ROWS]
+        key = band
+        for value in values:
+            key = (key * 1000003 ^ value) & _MASK
+        yield band, key
+
+
+def _similarity(grams, other):
+    if not grams or not other:
+        return 0.0
+    return 2 * len(grams & other) / (len(grams) + len(other))
+
+
+def split_blocks(body):
+    """Split editor HTML into plain-text blocks (paragraphs, list items)."""
+    blocks = []
+    for block in _BLOCK_END.split(body or ""):
+        text = _SPACE.sub(" ", unescape(_TAG.sub("", block))).strip()
+        if text:
+            blocks.append(text)
+    return blocks
+
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+
+
+def aligned_segments(en_body, fr_body):
+    """Yield (english, french) pairs from two bodies that have the same structure.
+
+    Blocks are paired when both bodies have the same number of them, and
+    sentences within a block when both blocks have the same number of
+    sentences. Anything that does not line up is skipped.
+    """
+    en_blocks, fr_blocks = split_blocks(en_body), split_blocks(fr_body)
+    if len(en_blocks) != len(fr_blocks):
+        return
+    for en_block, fr_block in zip(en_blocks, fr_blocks):
+        yield en_block, fr_block
+        en_sentences, fr_sentences = split_sentences(en_block), split_sentences(fr_block)
+        if len(en_sentences) > 1 and len(en_sentences) == len(fr_sentences):
+            yield from zip(en_sentences, fr_sentences)
+
+
+def template_segments():
+    """Fixed English/French sentences that appear in every generated notice."""
+    yield ENGLISH_ALERT_PREFIX, FRENCH_ALERT_PREFIX
+    yield from aligned_segments(ENGLISH_FOOTER, FRENCH_FOOTER)
+
+
+class TranslationMemory:
+    """MinHash/LSH index of English segments with their French translations."""
+
+    def __init__(self, english, french, band_keys, band_ids, notices=None):
+        self.english = english
+        self.french = french
+        self.band_keys = band_keys  # per band: sorted array('Q') of bucket keys
+        self.band_ids = band_ids  # per band: array('I') of segment ids, parallel to band_keys
+        self.notices = notices  # number of archived notices it holds, if built from the archive
+        # Segments added after the build, searched next to the arrays
+        self.added_english = []
+        self.added_french = []
+        self.added_ids = {}  # normalized English -> index into added_english
+        self.added_buckets = {}  # (band, bucket key) -> indexes into added_english, oldest first
+
+    @classmethod
+    def build(cls, pairs):
+        """Index an iterable of (english, french) segment pairs.
+
+        When an English segment has several translations, the most frequent
+        one is kept.
+        """
+        translations = defaultdict(Counter)
+        display = {}
+        for english, french in pairs:
+            key = normalize(english)
+            if key and french.strip():
+                translations[key][french.strip()] += 1
+                display.setdefault(key, english.strip())
+
+        english, french = [], []
+        entries = [[] for _ in range(BANDS)]
+        hash_cache = {}
+        for segment_id, (key, counter) in enumerate(translations.items()):
+            english.append(display[key])
+            french.append(counter.most_common(1)[0][0])
+            signature = _minhash(_gram_hashes(trigrams(key), hash_cache))
+            for band, band_key in _band_keys(signature):
+                entries[band].append((band_key, segment_id))
+
+        band_keys, band_ids = [], []
+        for band_entries in entries:
+            band_entries.sort()
+            band_keys.append(array("Q", (key for key, _ in band_entries)))
+            band_ids.append(array("I", (segment_id for _, segment_id in band_entries)))
+        return cls(english, french, band_keys, band_ids)
+
+    @classmethod
+    def from_archive(cls, archive):
+        """Build the memory from every notice in a NoticeArchive plus the template sentences."""
+
+        notices = archive.pairs()
+
+        def pairs():
+            yield from template_segments()
+            for en_title, fr_title, en_body, fr_body in notices:
+                yield en_title, fr_title
+                yield from aligned_segments(en_body, fr_body)
+
+        memory = cls.build(pairs())
+        memory.notices = len(notices)
+        return memory
+
+    def add(self, pairs):
+        """Add (english, french) segment pairs without rebuilding the arrays.
+
+        A segment added again takes the newer translation.
+        """
+        for english, french in pairs:
+            key = normalize(english)
+            french = french.strip()
+            if not key or not french:
+                continue
+            added_id = self.added_ids.get(key)
+            if added_id is not None:
+                self.added_french[added_id] = french
+                continue
+            added_id = len(self.added_english)
+            # Lists first: a lookup in another thread may find the id in a bucket at once
+            self.added_english.append(english.strip())
+            self.added_french.append(french)
+            self.added_ids[key] = added_id
+            for bucket in _band_keys(_minhash(_gram_hashes(trigrams(key)))):
+                self.added_buckets.setdefault(bucket, []).append(added_id)
+
+    def add_notice(self, en_title, fr_title, en_body, fr_body):
+        """Add the segments of one newly archived notice."""
+        self.add([(en_title, fr_title), *aligned_segments(en_body, fr_body)])
+        if self.notices is not None:
+            self.notices += 1
+
+    def __len__(self):
+        return len(self.english) + len(self.added_english)
+
+    def save(self, path=DEFAULT_PATH):
+        """Write the memory to `path`, replacing it atomically."""
+        directory = os.path.dirname(os.path.abspath(path))
+        descriptor, temporary = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                pickle.dump(
+                    (
+                        self.english, self.french, self.band_keys, self.band_ids, self.notices,
+                        list(zip(self.added_english, self.added_french)),
+                    ),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        memory = cls(*state[:5])
+        memory.add(state[5] if len(state) > 5 else ())
+        return memory
+
+    def lookup(self, text):
+        """Return the best Suggestion for one English segment, or None."""
+        grams = trigrams(text)
+        if not grams:
+            return None
+        votes = Counter()
+        added_votes = Counter()
+        for band, band_key in _band_keys(_minhash(_gram_hashes(grams))):
+            keys = self.band_keys[band]
+            start = bisect_left(keys, band_key)
+            end = bisect_right(keys, band_key, start)
+            # Ids within a bucket are ascending, so the tail is the most recently added
+            votes.update(self.band_ids[band][max(start, end - MAX_BUCKET):end])
+            added = self.added_buckets.get((band, band_key))
+            if added:
+                added_votes.update(added[-MAX_BUCKET:])
+
+        best, best_score = None, MIN_SCORE
+        for segment_id, _ in votes.most_common(MAX_CANDIDATES):
+            score = _similarity(grams, trigrams(self.english[segment_id]))
+            if score > best_score:
+                best, best_score = (self.english[segment_id], self.french[segment_id]), score
+        # Added segments are newer, so they win ties
+        for added_id, _ in added_votes.most_common(MAX_CANDIDATES):
+            score = _similarity(grams, trigrams(self.added_english[added_id]))
+            if score >= best_score:
+                best, best_score = (self.added_english[added_id], self.added_french[added_id]), score
+        if best is None:
+            return None
+        english, french = best
+        return Suggestion(text, french, round(best_score, 3), english)
+
+    def suggest(self, english_body):
+        """Return a Suggestion for each sentence of an English body that has a match."""
+        suggestions = []
+        for block in split_blocks(english_body):
+            for sentence in split_sentences(block):
+                suggestion = self.lookup(sentence)
+                if suggestion is not None:
+                    suggestions.append(suggestion)
+        return suggestions
+
+
+class SharedMemory:
+    """The memory of a running app, kept in step with the notice archive.
+
+    The saved memory is loaded in a background thread, so no page load waits
+    for it; memory is None until then. Notices archived since it was saved
+    are added to it, which costs about as much as indexing the notice. Only
+    when there is no usable saved memory is it built from the whole archive,
+    once, and saved; otherwise full rebuilds are left to
+    `python translation_memory.py build`. `archive` may be None, in which
+    case only the saved memory is used.
+    """
+
+    def __init__(self, archive, path=DEFAULT_PATH):
+        self.archive = archive
+        self.path = path
+        self.memory = None
+        self.lock = threading.Lock()
+        self.pending = False
+        self.thread = None
+        self.refresh()
+
+    def refresh(self):
+        """Add the notices archived since the last update, in the background.
+
+        Call it after archiving a notice. Calls made while an update is
+        running are folded into one more update when it finishes.
+        """
+        with self.lock:
+            self.pending = True
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="translation-memory", daemon=True)
+                self.thread.start()
+
+    def wait(self, timeout=None):
+        """Wait for the background work to finish; return True if it has."""
+        thread = self.thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.thread is None
+
+    def _run(self):
+        while True:
+            with self.lock:
+                if not self.pending:
+                    self.thread = None
+                    return
+                self.pending = False
+            try:
+                self._update()
+            except Exception as e:
+                print(f"translation memory: {e!r}", file=sys.stderr)
+
+    def _update(self):
+        if self.memory is None:
+            try:
+                self.memory = TranslationMemory.load(self.path)
+            except (OSError, EOFError, TypeError, pickle.UnpicklingError):
+                pass
+        if self.archive is None:
+            return
+        memory = self.memory
+        # A memory saved by an older version does not record its notice count,
+        # and one holding more notices than the archive is for another archive
+        if memory is None or memory.notices is None or memory.notices > len(self.archive):
+            self.memory = TranslationMemory.from_archive(self.archive)
+            try:
+                self.memory.save(self.path)
+            except OSError as e:
+                print(f"translation memory: not saved: {e}", file=sys.stderr)
+            return
+        for en_title, fr_title, en_body, fr_body in self.archive.pairs(start=memory.notices):
+            memory.add_notice(en_title, fr_title, en_body, fr_body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the offline translation memory.")
+    parser.add_argument("--path", default=DEFAULT_PATH, help=f"memory file (default: {DEFAULT_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="build the memory from the notice archive")
+    query = commands.add_parser("query", help="suggest French for an English text")
+    query.add_argument("text")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        from notice_archive import NoticeArchive
+
+        archive = NoticeArchive()
+        memory = TranslationMemory.from_archive(archive)
+        archive.close()
+        memory.save(args.path)
+        print(f"{len(memory)} segments written to {args.path}")
+        return 0
+
+    memory = TranslationMemory.load(args.path)
+    suggestions = memory.suggest(args.text)
+    if not suggestions:
+        print("No suggestions.", file=sys.stderr)
+        return 1
+    for suggestion in suggestions:
+        print(f"{suggestion.score:.2f}  {suggestion.english}\n      -> {suggestion.french}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())